@@ -0,0 +1,125 @@
+"""
+Microbenchmarks for the per-request hot path: strip_response, strip_comment
+and the normalize_* helpers.
+
+Needs pytest-benchmark (the bench extra). The file is named bench_*.py so
+the regular test run does not collect it; run it through micro.py to save
+a baseline and compare against it.
+"""
+
+import pytest
+
+import payloads
+
+pytest.importorskip("pytest_benchmark")
+
+from redlib_mcp import (  # noqa: E402
+    normalize_path,
+    normalize_post,
+    normalize_subreddit,
+    normalize_user,
+    parse_fields,
+    strip_and_serialize,
+    strip_comment,
+    strip_response,
+)
+
+REDLIB_URL = "https://redlib.example.com"
+
+# Inputs as users and LLMs pass them: bare names, prefixed names, paths and full URLs
+SUBREDDITS = [
+    "rust", "r/rust", "/r/rust/", "r/rust/top", "https://www.reddit.com/r/rust/?sort=new",
+    "https://old.reddit.com/r/python/", f"{REDLIB_URL}/r/programming/hot", "https://example.org/r/golang",
+]
+USERS = [
+    "spez", "u/spez", "/u/spez/", "user/spez/submitted", "https://www.reddit.com/user/spez/",
+    "https://reddit.com/u/kn0thing?sort=top", f"{REDLIB_URL}/user/someone/comments",
+]
+POSTS = [
+    "abc123", "/comments/abc123", "r/rust/comments/abc123/some_title/",
+    "https://www.reddit.com/r/rust/comments/abc123/some_title/?utm_source=share",
+    "https://redd.it/abc123", f"{REDLIB_URL}/r/rust/comments/abc123/some_title",
+]
+
+
+@pytest.fixture(scope="module")
+def listing_100():
+    return payloads.listing(posts=100)
+
+
+@pytest.fixture(scope="module")
+def thread_10k():
+    # 3 replies per comment, 8 levels: 9840 comments
+    return payloads.post_with_comments(depth=8, width=3)
+
+
+@pytest.fixture(scope="module")
+def deep_chain():
+    # A single reply chain 500 levels deep
+    return payloads.post_with_comments(depth=500, width=1)
+
+
+@pytest.mark.benchmark(group="strip")
+def test_strip_listing(benchmark, listing_100):
+    result = benchmark(strip_response, listing_100)
+    assert len(result["data"]["posts"]) == 100
+
+
+@pytest.mark.benchmark(group="strip")
+def test_strip_listing_fields(benchmark, listing_100):
+    fields = parse_fields(["title", "score", "permalink"])
+    result = benchmark(strip_response, listing_100, fields=fields)
+    assert set(result["data"]["posts"][0]) == {"id", "title", "score", "permalink"}
+
+
+@pytest.mark.benchmark(group="strip")
+def test_strip_thread_10k(benchmark, thread_10k):
+    result = benchmark(strip_response, thread_10k)
+    assert len(result["data"]["comments"]) == 3
+
+
+@pytest.mark.benchmark(group="strip")
+def test_strip_thread_10k_bounded(benchmark, thread_10k):
+    result = benchmark(strip_response, thread_10k, max_depth=3, max_comments=500)
+    assert result["data"]["comments"]
+
+
+@pytest.mark.benchmark(group="strip")
+def test_strip_comment_deep_chain(benchmark, deep_chain):
+    comment = deep_chain["data"]["comments"][0]
+    result = benchmark(strip_comment, comment)
+    assert result["id"] == comment["id"]
+
+
+@pytest.mark.benchmark(group="strip")
+def test_strip_and_serialize_thread_10k(benchmark, thread_10k):
+    output = benchmark(strip_and_serialize, thread_10k, {})
+    assert output.startswith("{")
+
+
+def normalize_all(func, inputs):
+    return [func(value, REDLIB_URL) for value in inputs]
+
+
+@pytest.mark.benchmark(group="normalize")
+def test_normalize_path(benchmark):
+    result = benchmark(normalize_all, normalize_path, SUBREDDITS + USERS + POSTS)
+    assert result[0] == "/rust"
+
+
+@pytest.mark.benchmark(group="normalize")
+def test_normalize_subreddit(benchmark):
+    result = benchmark(normalize_all, normalize_subreddit, SUBREDDITS)
+    assert result[0] == "/r/rust"
+
+
+@pytest.mark.benchmark(group="normalize")
+def test_normalize_user(benchmark):
+    result = benchmark(normalize_all, normalize_user, USERS)
+    assert result[1] == "/user/spez"
+
+
+@pytest.mark.benchmark(group="normalize")
+def test_normalize_post(benchmark):
+    result = benchmark(normalize_all, normalize_post, POSTS)
+    assert result[0] == "/comments/abc123"
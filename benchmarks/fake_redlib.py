@@ -0,0 +1,87 @@
+"""
+Local stand-in for Redlib that serves synthetic .js payloads.
+
+Payloads are generated once at startup (see payloads.py) and served as
+bytes, so the fake server costs little CPU next to the server under
+test. Latency injection delays every response.
+
+Usage:
+    python benchmarks/fake_redlib.py --port 8081 --posts 25 --depth 4 --width 4 --latency-ms 20
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+from pathlib import Path
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import payloads  # noqa: E402
+
+
+def create_app(
+    posts: int = 25,
+    depth: int = 4,
+    width: int = 4,
+    body_chars: int = 400,
+    latency_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+) -> Starlette:
+    """Build the fake Redlib app. Every request waits latency_ms plus up to jitter_ms."""
+    bodies = {
+        kind: json.dumps(payload).encode()
+        for kind, payload in {
+            "listing": payloads.listing(posts, body_chars),
+            "post": payloads.post_with_comments(depth, width, body_chars // 2),
+            "wiki": payloads.wiki(),
+            "duplicates": payloads.duplicates(),
+        }.items()
+    }
+
+    def kind_of(path: str) -> str:
+        if "/wiki/" in path:
+            return "wiki"
+        if "/duplicates/" in path:
+            return "duplicates"
+        if "/comments/" in path:
+            return "post"
+        return "listing"
+
+    async def handle(request: Request) -> Response:
+        path = request.url.path
+        if not path.endswith(".js"):
+            return Response(status_code=404)
+        delay = latency_ms + (random.uniform(0, jitter_ms) if jitter_ms else 0)
+        if delay:
+            await asyncio.sleep(delay / 1000)
+        return Response(bodies[kind_of(path[:-3])], media_type="application/json")
+
+    return Starlette(routes=[Route("/{path:path}", handle)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--posts", type=int, default=25, help="posts per listing page")
+    parser.add_argument("--depth", type=int, default=4, help="comment tree depth")
+    parser.add_argument("--width", type=int, default=4, help="replies per comment")
+    parser.add_argument("--body-chars", type=int, default=400, help="post body length")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="delay added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="random extra delay, up to this much")
+    args = parser.parse_args()
+
+    app = create_app(args.posts, args.depth, args.width, args.body_chars, args.latency_ms, args.jitter_ms)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
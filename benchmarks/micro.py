@@ -0,0 +1,52 @@
+"""
+Save and compare microbenchmark baselines (bench_micro.py).
+
+Baselines are stored by pytest-benchmark under benchmarks/.benchmarks/,
+one directory per platform and Python version, so only runs on the same
+kind of machine are compared. "compare" checks the latest saved baseline
+and exits non-zero when any benchmark's median is slower by more than the
+threshold.
+
+Usage:
+    python benchmarks/micro.py save
+    python benchmarks/micro.py run
+    python benchmarks/micro.py compare --threshold 25
+    python benchmarks/micro.py compare -- -k normalize
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).parent
+STORAGE = BENCH_DIR / ".benchmarks"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Save or compare microbenchmark baselines.")
+    parser.add_argument("command", choices=("save", "compare", "run"))
+    parser.add_argument("--name", default="baseline", help="name for a saved baseline")
+    parser.add_argument("--threshold", type=int, default=15, help="allowed median slowdown in percent")
+    args, pytest_args = parser.parse_known_args()
+    # Anything unrecognised (e.g. -k normalize) goes to pytest
+    pytest_args = [arg for arg in pytest_args if arg != "--"]
+
+    command = [
+        sys.executable, "-m", "pytest", str(BENCH_DIR / "bench_micro.py"),
+        "-p", "no:cacheprovider",
+        f"--benchmark-storage={STORAGE}",
+        "--benchmark-columns=min,median,mean,stddev,rounds",
+        "--benchmark-sort=name",
+    ]
+    if args.command == "save":
+        command.append(f"--benchmark-save={args.name}")
+    elif args.command == "compare":
+        if not any(STORAGE.glob("*/*.json")):
+            sys.exit(f"No saved baseline in {STORAGE}; run 'python benchmarks/micro.py save' first")
+        command += ["--benchmark-compare", f"--benchmark-compare-fail=median:{args.threshold}%"]
+    sys.exit(subprocess.call(command + pytest_args, cwd=BENCH_DIR.parent))
+
+
+if __name__ == "__main__":
+    main()
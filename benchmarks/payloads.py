@@ -0,0 +1,142 @@
+"""
+Synthetic Redlib JSON payloads for benchmarks.
+
+Shapes follow Redlib's .js endpoints and carry the extra fields that
+strip_response removes (media, awards, flair objects, thumbnails), so
+stripping and serialization do realistic work. Output is deterministic
+for a given seed.
+"""
+
+import random
+
+WORDS = (
+    "rust async memory borrow checker compile lifetime trait generic tokio serde "
+    "thread pool cache latency benchmark allocation iterator closure unsafe vector "
+    "string parse network socket server client request response stream buffer"
+).split()
+
+
+def text(rng: random.Random, chars: int) -> str:
+    """Random words up to roughly chars characters."""
+    out = []
+    length = 0
+    while length < chars:
+        word = rng.choice(WORDS)
+        out.append(word)
+        length += len(word) + 1
+    return " ".join(out)
+
+
+def author(rng: random.Random) -> dict:
+    name = f"user{rng.randrange(10_000)}"
+    return {
+        "name": name,
+        "flair": {"flair_parts": [{"flair_part_type": "text", "value": "Contributor"}], "text": "Contributor"},
+        "distinguished": "",
+    }
+
+
+def make_post(rng: random.Random, index: int, subreddit: str = "bench", body_chars: int = 400) -> dict:
+    post_id = f"p{index:05d}"
+    return {
+        "id": post_id,
+        "title": text(rng, 80),
+        "community": subreddit,
+        "subreddit": subreddit,
+        "body": text(rng, body_chars),
+        "author": author(rng),
+        "permalink": f"/r/{subreddit}/comments/{post_id}/{'_'.join(rng.sample(WORDS, 4))}/",
+        "link_title": "",
+        "poll": None,
+        "score": rng.randrange(100_000),
+        "upvote_ratio": rng.randrange(50, 100),
+        "post_type": "self",
+        "flair": {"flair_parts": [{"flair_part_type": "text", "value": "Discussion"}], "text": "Discussion"},
+        "flags": {"spoiler": False, "nsfw": False, "stickied": False},
+        "nsfw": False,
+        "thumbnail": {"url": f"https://b.thumbs.example/{post_id}.jpg", "alt_url": "", "width": 140, "height": 140},
+        "media": {"url": "", "alt_url": "", "width": 0, "height": 0, "poster": ""},
+        "domain": f"self.{subreddit}",
+        "rel_time": "3h ago",
+        "created": "Fri, 17 Oct 2025 12:00:00 +0000",
+        "created_ts": 1760702400,
+        "num_duplicates": 0,
+        "num_comments": rng.randrange(2_000),
+        "comments": ["0", "0"],
+        "gallery": [],
+        "awards": [{"name": "Helpful", "icon_url": "https://i.example/award.png", "count": 1}],
+        "nsfw_blurred": False,
+        "ws_url": "",
+        "url": f"https://example.com/{post_id}",
+        "is_self": True,
+    }
+
+
+def make_comments(rng: random.Random, depth: int, width: int, body_chars: int = 200, prefix: str = "c") -> list:
+    """A comment tree with width replies per comment, depth levels deep."""
+    if depth <= 0:
+        return []
+    comments = []
+    for i in range(width):
+        comment_id = f"{prefix}{i}"
+        comments.append({
+            "id": comment_id,
+            "kind": "t1",
+            "parent_id": "",
+            "parent_kind": "t1",
+            "post_link": "",
+            "post_author": "op",
+            "body": text(rng, body_chars),
+            "author": author(rng),
+            "score": rng.randrange(1_000),
+            "rel_time": "2h ago",
+            "created": "Fri, 17 Oct 2025 13:00:00 +0000",
+            "edited": ["", ""],
+            "replies": make_comments(rng, depth - 1, width, body_chars, f"{comment_id}_"),
+            "highlighted": False,
+            "awards": [],
+            "collapsed": False,
+            "is_filtered": False,
+            "more_count": 0,
+            "prefs": {"blur_spoiler": "", "hide_awards": ""},
+        })
+    return comments
+
+
+def listing(posts: int = 25, body_chars: int = 400, subreddit: str = "bench", seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    return {
+        "data": {
+            "subreddit": {"name": subreddit, "title": text(rng, 40), "members": ["1.2m", "1200000"]},
+            "posts": [make_post(rng, i, subreddit, body_chars) for i in range(posts)],
+            "after": f"t3_p{posts - 1:05d}",
+        },
+        "error": None,
+    }
+
+
+def post_with_comments(depth: int = 4, width: int = 4, body_chars: int = 200, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    return {
+        "data": {
+            "post": make_post(rng, 0, body_chars=body_chars * 4),
+            "comments": make_comments(rng, depth, width, body_chars),
+        },
+        "error": None,
+    }
+
+
+def wiki(chars: int = 20_000, subreddit: str = "bench", seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    return {"data": {"subreddit": subreddit, "wiki_page": "index", "content": text(rng, chars)}, "error": None}
+
+
+def duplicates(count: int = 10, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    return {
+        "data": {
+            "post": make_post(rng, 0),
+            "duplicates": [make_post(rng, i + 1) for i in range(count)],
+        },
+        "error": None,
+    }
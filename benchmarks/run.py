@@ -0,0 +1,236 @@
+"""
+End-to-end benchmark for redlib-mcp against a local fake Redlib.
+
+Starts benchmarks/fake_redlib.py and the MCP server (over stdio and/or
+HTTP), then calls each tool under load. Reports throughput, p50/p99
+latency and server memory per tool.
+
+The response and output caches are off by default, so every call goes
+through fetch, strip and serialize. Pass --cache to keep them. Other
+REDLIB_* settings from the environment are passed through, for example
+REDLIB_JSON_BACKEND=json to compare JSON backends.
+
+Usage:
+    python benchmarks/run.py
+    python benchmarks/run.py --transport http --tools get_post --calls 500 --concurrency 16 --latency-ms 20
+    python benchmarks/run.py --json results.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from fastmcp import Client
+from fastmcp.client.transports import StdioTransport
+
+BENCH_DIR = Path(__file__).parent
+
+# Arguments for call i of each tool; inputs rotate so caches (when enabled) see repeats
+TOOL_ARGS = {
+    "get_subreddit": lambda i: {"subreddit": f"bench{i % 50}"},
+    "search_reddit": lambda i: {"query": f"query {i % 50}"},
+    "get_user": lambda i: {"username": f"user{i % 50}"},
+    "get_post": lambda i: {"post": f"p{i % 50:05d}"},
+    "get_wiki": lambda i: {"subreddit": f"bench{i % 50}"},
+    "get_duplicates": lambda i: {"post": f"p{i % 50:05d}"},
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(url: str, timeout: float = 30.0):
+    """Poll url until the server answers at all (any status code)."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.TransportError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Server at {url} did not start within {timeout:.0f}s")
+
+
+def memory_mb(pid: int | None) -> tuple[float | None, float | None]:
+    """Current and peak RSS of a process in MiB (Linux only; None elsewhere)."""
+    if pid is None:
+        return None, None
+    try:
+        status = Path(f"/proc/{pid}/status").read_text()
+    except OSError:
+        return None, None
+    fields = dict(line.split(":", 1) for line in status.splitlines() if ":" in line)
+
+    def read(key: str) -> float | None:
+        value = fields.get(key)
+        return int(value.split()[0]) / 1024 if value else None
+
+    return read("VmRSS"), read("VmHWM")
+
+
+def percentile(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p * len(ordered)) - 1)]
+
+
+def server_env(args, redlib_url: str, pid_file: str) -> dict:
+    env = dict(os.environ)
+    # A benchmark run must not pick up OAuth, multiple backends or tracing by accident
+    for key in ("ACCESS_CLIENT_ID", "ACCESS_CLIENT_SECRET", "REDLIB_URLS"):
+        env.pop(key, None)
+    env["REDLIB_URL"] = redlib_url
+    env["BENCH_PID_FILE"] = pid_file
+    env.setdefault("REDLIB_RATE_LIMIT", "0")
+    env.setdefault("REDLIB_RETRIES", "0")
+    if not args.cache:
+        env["REDLIB_CACHE_ENTRIES"] = "0"
+        env["REDLIB_OUTPUT_CACHE_ENTRIES"] = "0"
+        env["REDLIB_DISK_CACHE"] = "false"
+    return env
+
+
+async def bench_tool(mcp: Client, tool: str, args) -> dict:
+    make_args = TOOL_ARGS[tool]
+    for i in range(args.warmup):
+        await mcp.call_tool(tool, make_args(i))
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: list[float] = []
+    errors = 0
+
+    async def call(i: int):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await mcp.call_tool(tool, make_args(i))
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(call(i) for i in range(args.calls)))
+    elapsed = time.perf_counter() - start
+    return {
+        "tool": tool,
+        "calls": args.calls,
+        "errors": errors,
+        "throughput": args.calls / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+async def bench_transport(transport: str, args, redlib_url: str) -> list[dict]:
+    pid_file = tempfile.NamedTemporaryFile(suffix=".pid", delete=False).name
+    env = server_env(args, redlib_url, pid_file)
+    serve = [sys.executable, str(BENCH_DIR / "serve.py"), transport]
+    process = None
+
+    if transport == "http":
+        port = free_port()
+        env.update(MCP_SERVER_HOST="127.0.0.1", MCP_SERVER_PORT=str(port))
+        process = subprocess.Popen(serve, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        wait_until_ready(f"http://127.0.0.1:{port}/mcp")
+        target = f"http://127.0.0.1:{port}/mcp"
+    else:
+        target = StdioTransport(command=serve[0], args=serve[1:], env=env)
+
+    results = []
+    try:
+        async with Client(target, timeout=60) as mcp:
+            pid_text = Path(pid_file).read_text()
+            pid = int(pid_text) if pid_text else None
+            for tool in args.tools:
+                result = await bench_tool(mcp, tool, args)
+                result["transport"] = transport
+                result["rss_mb"], result["peak_rss_mb"] = memory_mb(pid)
+                results.append(result)
+                print_row(result)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+        os.unlink(pid_file)
+    return results
+
+
+def print_row(result: dict):
+    rss = f"{result['rss_mb']:.1f}" if result["rss_mb"] is not None else "n/a"
+    print(
+        f"{result['transport']:<6} {result['tool']:<15} {result['calls']:>6} {result['errors']:>6} "
+        f"{result['throughput']:>9.1f} {result['p50_ms']:>8.2f} {result['p99_ms']:>8.2f} {rss:>8}",
+        flush=True,
+    )
+
+
+async def run(args) -> list[dict]:
+    port = free_port()
+    redlib_url = f"http://127.0.0.1:{port}"
+    fake = subprocess.Popen(
+        [
+            sys.executable, str(BENCH_DIR / "fake_redlib.py"),
+            "--port", str(port),
+            "--posts", str(args.posts),
+            "--depth", str(args.depth),
+            "--width", str(args.width),
+            "--body-chars", str(args.body_chars),
+            "--latency-ms", str(args.latency_ms),
+            "--jitter-ms", str(args.jitter_ms),
+        ]
+    )
+    try:
+        wait_until_ready(f"{redlib_url}/r/all.js")
+        print(f"{'mode':<6} {'tool':<15} {'calls':>6} {'errors':>6} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'rss MB':>8}")
+        results = []
+        for transport in args.transport:
+            results += await bench_transport(transport, args, redlib_url)
+        return results
+    finally:
+        fake.terminate()
+        fake.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark redlib-mcp tools against a fake Redlib.")
+    parser.add_argument("--transport", nargs="+", choices=("stdio", "http"), default=["stdio", "http"])
+    parser.add_argument("--tools", nargs="+", choices=sorted(TOOL_ARGS), default=list(TOOL_ARGS))
+    parser.add_argument("--calls", type=int, default=200, help="measured calls per tool")
+    parser.add_argument("--warmup", type=int, default=10, help="unmeasured calls per tool first")
+    parser.add_argument("--concurrency", type=int, default=8, help="calls in flight at once")
+    parser.add_argument("--posts", type=int, default=25, help="posts per listing page")
+    parser.add_argument("--depth", type=int, default=4, help="comment tree depth")
+    parser.add_argument("--width", type=int, default=4, help="replies per comment")
+    parser.add_argument("--body-chars", type=int, default=400, help="post body length")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="fake Redlib response delay")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="random extra fake Redlib delay")
+    parser.add_argument("--cache", action="store_true", help="keep the response and output caches on")
+    parser.add_argument("--json", type=Path, help="also write results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.json:
+        report = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "options": {k: v for k, v in vars(args).items() if k != "json"},
+            "results": results,
+        }
+        args.json.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
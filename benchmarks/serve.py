@@ -0,0 +1,26 @@
+"""
+Start redlib-mcp for the benchmark harness.
+
+Runs main() (stdio) or main_server() (HTTP) from the source tree and
+writes the process id to BENCH_PID_FILE so run.py can sample its memory.
+
+Usage:
+    python benchmarks/serve.py stdio|http
+"""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import redlib_mcp  # noqa: E402
+
+if __name__ == "__main__":
+    pid_file = os.getenv("BENCH_PID_FILE")
+    if pid_file:
+        Path(pid_file).write_text(str(os.getpid()))
+    if sys.argv[1:] == ["http"]:
+        redlib_mcp.main_server()
+    else:
+        redlib_mcp.main()
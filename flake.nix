@@ -151,6 +151,7 @@
             pythonPackages.black
             pythonPackages.pytest
             pythonPackages.pytest-asyncio
+            pythonPackages.pytest-benchmark
             pythonPackages.httpx
             pythonPackages.uvicorn
             pythonPackages.starlette
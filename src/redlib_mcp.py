@@ -5,15 +5,66 @@ Redlib MCP Server
 MCP server that exposes Redlib's JSON API endpoints to LLMs.
 """
 
+import asyncio
+import contextvars
+import cProfile
+import csv
+import functools
+import hashlib
+import io
 import json
 import logging
 import os
+import random
+import re
+import sqlite3
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager, nullcontext
+from email.utils import parsedate_to_datetime
 from pathlib import Path
-from urllib.parse import urlparse
+from typing import Any, Awaitable, Callable
+from urllib.parse import urlencode, urlparse
 
 import httpx
-from fastmcp import FastMCP
+from fastmcp import Context, FastMCP
 from fastmcp.server.auth.oidc_proxy import OIDCProxy
+from fastmcp.server.middleware import Middleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+try:
+    import ijson
+except ImportError:  # Optional: only needed for REDLIB_STREAMING
+    ijson = None
+
+# Optional fast JSON backends (see set_json_backend)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+    from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+except ImportError:  # Optional: only needed for the /metrics endpoint
+    prometheus_client = None
+
+try:
+    from opentelemetry import trace
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+except ImportError:  # Optional: only needed for REDLIB_TRACING
+    trace = None
 
 # Known Reddit domains to strip
 REDDIT_DOMAINS = {
@@ -25,68 +76,666 @@ REDDIT_DOMAINS = {
     "m.reddit.com",
 }
 
-# Essential fields for LLM consumption - strip everything else
-POST_FIELDS = {
+# Essential fields for LLM consumption - strip everything else.
+# The tuples fix the output key order; the sets are for membership tests.
+POST_FIELD_ORDER = (
     "id", "title", "body", "author", "subreddit", "score", "upvote_ratio",
     "permalink", "num_comments", "created", "nsfw", "url", "thumbnail",
     "is_self", "domain", "flair",
-}
-COMMENT_FIELDS = {"id", "body", "author", "score", "created", "replies", "kind"}
+)
+COMMENT_FIELD_ORDER = ("id", "body", "author", "score", "created", "replies", "kind")
+POST_FIELDS = set(POST_FIELD_ORDER)
+COMMENT_FIELDS = set(COMMENT_FIELD_ORDER)
+
+# Output budgets: characters per token for max_tokens, shortest text left by truncation
+CHARS_PER_TOKEN = 4
+BUDGET_MIN_TEXT = 200
+TRUNCATION_SUFFIX = "…"
+
+# Listing output formats: JSON objects, or posts as columns + rows / delimited text
+OUTPUT_FORMATS = ("json", "table", "csv", "tsv")
+
+# Batch tools: maximum items per call and concurrent fetches per batch
+BATCH_MAX_ITEMS = 50
+BATCH_CONCURRENCY = 8
+
+# Longest Retry-After pause honored before a 429 is surfaced, in seconds
+MAX_RETRY_AFTER = 60
+
+# Upstream statuses worth retrying for idempotent GETs
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Hedged requests: latency samples kept, samples needed before hedging, minimum delay
+HEDGE_SAMPLES = 256
+HEDGE_MIN_SAMPLES = 20
+HEDGE_MIN_DELAY = 0.05
+
+# Backend pool: EWMA smoothing for latency, consecutive failures before ejection,
+# and how long an ejected backend sits out before it is tried again
+BACKEND_EWMA_ALPHA = 0.3
+BACKEND_EJECT_FAILURES = 3
+BACKEND_EJECT_SECONDS = 30
+
+# Auto-pagination: most pages a listing tool will follow in one call
+PAGINATE_MAX_PAGES = 20
+
+# Metrics histogram buckets: tool phases in seconds, response sizes in bytes
+PHASE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# Profiling: seconds between re-reads of the profiling settings, allocation sites kept per profile
+PROFILE_RELOAD_SECONDS = 5.0
+PROFILE_TOP_ALLOCATIONS = 25
+
+# JSON backends in order of preference for "auto"
+JSON_BACKENDS = ("orjson", "msgspec", "json")
+
+# Response cache TTLs in seconds, matched against the request path (first match wins)
+CACHE_TTLS = [
+    (re.compile(r"/wiki(/|$)"), 6 * 60 * 60),
+    (re.compile(r"/new$"), 15),
+    (re.compile(r"/rising$"), 30),
+    (re.compile(r"/search$"), 120),
+    (re.compile(r"/comments/"), 60),
+    (re.compile(r"/duplicates/"), 300),
+    (re.compile(r"/top$"), 600),
+]
+DEFAULT_CACHE_TTL = 60
+
+# On-disk cache: file name inside REDLIB_CACHE_DIR and writes between compactions
+DISK_CACHE_FILE = "cache.sqlite3"
+DISK_CACHE_COMPACT_EVERY = 200
+
+# Response sizes remembered per request for offload decisions
+RESPONSE_SIZES_MAX = 1024
+
+# Returned in place of a body when Redlib answers 304 Not Modified
+NOT_MODIFIED = object()
+
+# Paths whose stale cached responses are served immediately while they refresh
+# in the background: wiki pages and subreddit listings
+STALE_WHILE_REVALIDATE_PATHS = [
+    re.compile(r"/wiki(/|$)"),
+    re.compile(r"^/r/[^/]+/(hot|new|top|rising|controversial)$"),
+]
+
+
+def _stdlib_dumps(obj: Any) -> str:
+    # NaN and Infinity are not valid JSON, so refuse them rather than emit them
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, allow_nan=False)
+
+
+def _fast_dumps(encode: Callable[[Any], bytes]) -> Callable[[Any], str]:
+    """Wrap a bytes encoder, falling back to the stdlib for values it rejects."""
+    def dumps(obj: Any) -> str:
+        try:
+            return encode(obj).decode()
+        except (TypeError, ValueError, OverflowError):
+            return _stdlib_dumps(obj)
+    return dumps
+
+
+# Active JSON backend, selected by set_json_backend()
+json_backend = "json"
+json_loads: Callable[[bytes | str], Any] = json.loads
+json_dumps: Callable[[Any], str] = _stdlib_dumps
 
 
-def strip_post(post: dict) -> dict:
-    """Strip a post to essential fields for LLM consumption."""
-    result = {k: v for k, v in post.items() if k in POST_FIELDS}
+def set_json_backend(name: str = "auto") -> str:
+    """
+    Select the JSON backend used to parse Redlib bodies and emit tool output.
+
+    name is "orjson", "msgspec", "json" or "auto" (the first installed of
+    JSON_BACKENDS). Every backend emits compact UTF-8 JSON that decodes to
+    the same values, but the bytes can differ for floats: the stdlib writes
+    1e+16 and 1e-05 where orjson and msgspec write 1e16 and 0.00001. NaN and
+    infinity raise ValueError with the stdlib and become null with the
+    others. Returns the backend actually selected.
+    """
+    global json_backend, json_loads, json_dumps
+    available = {
+        "orjson": orjson is not None,
+        "msgspec": msgspec is not None,
+        "json": True,
+    }
+    if name == "auto":
+        name = next(backend for backend in JSON_BACKENDS if available[backend])
+    elif not available.get(name):
+        logger.warning(f"JSON backend {name!r} is not available - using the standard library")
+        name = "json"
+
+    if name == "orjson":
+        json_loads, json_dumps = orjson.loads, _fast_dumps(orjson.dumps)
+    elif name == "msgspec":
+        json_loads, json_dumps = msgspec.json.decode, _fast_dumps(msgspec.json.encode)
+    else:
+        json_loads, json_dumps = json.loads, _stdlib_dumps
+    json_backend = name
+    return name
+
+
+def parse_fields(fields: list[str] | None) -> tuple[str, ...] | None:
+    """
+    Validate a caller's field selection for post projections.
+
+    Returns a sorted tuple (so equal selections share a cached plan and
+    output cache key), or None for the default projection. "id" is always
+    kept so pagination cursors can still be built.
+    """
+    if not fields:
+        return None
+    unknown = sorted(set(fields) - POST_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)} (choose from {', '.join(POST_FIELD_ORDER)})")
+    return tuple(sorted({"id", *fields}))
+
+
+@functools.lru_cache(maxsize=256)
+def projection(
+    order: tuple[str, ...],
+    fields: tuple[str, ...] | None,
+    keep: tuple[str, ...] = (),
+) -> tuple[str, ...]:
+    """Keys to copy, in output order: order narrowed to fields plus keep. Cached per field set."""
+    if fields is None:
+        return order
+    wanted = set(fields) | set(keep)
+    return tuple(k for k in order if k in wanted)
+
+
+def strip_post(post: dict, fields: tuple[str, ...] | None = None) -> dict:
+    """Strip a post to essential fields (or just fields, see parse_fields) for LLM consumption."""
+    # Look up the known fields rather than scanning every key of the source
+    result = {k: post[k] for k in projection(POST_FIELD_ORDER, fields) if k in post}
     # Simplify author to just name
     if "author" in result and isinstance(result["author"], dict):
         result["author"] = result["author"].get("name", "")
     return result
 
 
-def strip_comment(comment: dict) -> dict:
-    """Strip a comment to essential fields, recursively handling replies."""
-    result = {k: v for k, v in comment.items() if k in COMMENT_FIELDS}
-    # Simplify author to just name
-    if "author" in result and isinstance(result["author"], dict):
-        result["author"] = result["author"].get("name", "")
-    # Recursively strip replies
-    if "replies" in result and isinstance(result["replies"], list):
-        result["replies"] = [strip_comment(r) for r in result["replies"]]
+def more_marker(count: int) -> dict:
+    """Placeholder for comments omitted by a depth or size budget."""
+    return {"kind": "more", "count": count}
+
+
+def strip_comments(
+    comments: list,
+    max_depth: int | None = None,
+    max_comments: int | None = None,
+    fields: tuple[str, ...] | None = None,
+) -> list:
+    """
+    Strip a list of comments and their replies without recursion.
+
+    Comments are visited depth-first in thread order using an explicit
+    stack. Replies nested deeper than max_depth (1 = top-level only) and
+    comments past the max_comments budget are replaced by a more_marker()
+    holding the number of comments omitted at that level. fields narrows
+    the projection; replies and kind are always kept.
+    """
+    keys = projection(COMMENT_FIELD_ORDER, fields, ("replies", "kind"))
+    if max_depth is not None:
+        max_depth = max(1, max_depth)
+    remaining = max_comments
+
+    result: list = []
+    # (source list, next index, output list, depth of comments in the list)
+    stack = [(comments, 0, result, 1)]
+    while stack:
+        source, index, out, depth = stack.pop()
+        if index >= len(source):
+            continue
+        if remaining is not None and remaining <= 0:
+            out.append(more_marker(len(source) - index))
+            continue
+        stack.append((source, index + 1, out, depth))
+
+        raw = source[index]
+        comment = {k: raw[k] for k in keys if k in raw}
+        # Simplify author to just name
+        if "author" in comment and isinstance(comment["author"], dict):
+            comment["author"] = comment["author"].get("name", "")
+        out.append(comment)
+        if remaining is not None:
+            remaining -= 1
+
+        replies = comment.get("replies")
+        if isinstance(replies, list):
+            if max_depth is not None and depth >= max_depth:
+                comment["replies"] = [more_marker(len(replies))] if replies else []
+            else:
+                comment["replies"] = []
+                stack.append((replies, 0, comment["replies"], depth + 1))
+
     return result
 
 
-def strip_response(data: dict) -> dict:
-    """Strip API response to essential fields for minimal LLM payloads."""
+def strip_comment(
+    comment: dict,
+    max_depth: int | None = None,
+    max_comments: int | None = None,
+    fields: tuple[str, ...] | None = None,
+) -> dict:
+    """Strip a comment to essential fields, including its replies."""
+    return strip_comments([comment], max_depth, max_comments, fields)[0]
+
+
+def strip_response(
+    data: dict,
+    max_depth: int | None = None,
+    max_comments: int | None = None,
+    fields: tuple[str, ...] | None = None,
+) -> dict:
+    """
+    Strip API response to essential fields for minimal LLM payloads.
+
+    max_depth and max_comments bound the comment tree (see strip_comments).
+    fields narrows the post and comment projections (see parse_fields).
+    """
     result = {}
 
     # Handle post
     if "post" in data:
-        result["post"] = strip_post(data["post"])
+        result["post"] = strip_post(data["post"], fields)
 
     # Handle posts array
     if "posts" in data and isinstance(data["posts"], list):
-        result["posts"] = [strip_post(p) for p in data["posts"]]
+        result["posts"] = [strip_post(p, fields) for p in data["posts"]]
 
     # Handle comments array
     if "comments" in data and isinstance(data["comments"], list):
-        result["comments"] = [strip_comment(c) for c in data["comments"]]
+        result["comments"] = strip_comments(data["comments"], max_depth, max_comments, fields)
 
     # Handle duplicates array
     if "duplicates" in data and isinstance(data["duplicates"], list):
-        result["duplicates"] = [strip_post(d) for d in data["duplicates"]]
+        result["duplicates"] = [strip_post(d, fields) for d in data["duplicates"]]
 
     # Preserve pagination and metadata
     for key in ("after", "before", "subreddit", "wiki_page", "content", "data"):
         if key in data:
             if key == "data" and isinstance(data[key], dict):
                 # Recursively strip data wrapper
-                result[key] = strip_response(data[key])
+                result[key] = strip_response(data[key], max_depth, max_comments, fields)
             else:
                 result[key] = data[key]
 
     return result
 
 
+def budget_chars(max_chars: int | None = None, max_tokens: int | None = None) -> int | None:
+    """Combine max_chars and max_tokens (CHARS_PER_TOKEN characters each) into one character budget."""
+    if max_tokens is not None:
+        max_tokens *= CHARS_PER_TOKEN
+    limits = [n for n in (max_chars, max_tokens) if n is not None]
+    return max(1, min(limits)) if limits else None
+
+
+def _comment_score(comment: dict) -> float:
+    score = comment.get("score")
+    return score if isinstance(score, (int, float)) else 0
+
+
+class _PrunedList:
+    """
+    Comments dropped from one sibling list, applied in a single rebuild.
+
+    Dropping only records the comment and does the size accounting, so
+    pruning many comments from a long list stays linear. rebuild() removes
+    them and counts them in the list's trailing more_marker().
+    """
+
+    def __init__(self, siblings: list):
+        self.siblings = siblings
+        self.dropped: set[int] = set()
+        self.count = len(siblings)
+        last = siblings[-1] if siblings else None
+        self.marker = last if isinstance(last, dict) and last.get("kind") == "more" else None
+        self.new_marker = False
+
+    def drop(self, comment: dict) -> int:
+        """Drop comment, which must have no pending drops of its own. Returns characters saved."""
+        saved = len(json_dumps(comment))
+        self.dropped.add(id(comment))
+        self.count -= 1
+        # The separating comma goes too, unless it was the only item
+        saved += 1 if self.count else 0
+        if self.marker is not None:
+            saved -= len(str(self.marker["count"] + 1)) - len(str(self.marker["count"]))
+            self.marker["count"] += 1
+        else:
+            self.marker = more_marker(1)
+            self.new_marker = True
+            saved -= len(json_dumps(self.marker)) + (1 if self.count else 0)
+            self.count += 1
+        return saved
+
+    def rebuild(self):
+        if not self.dropped:
+            return
+        self.siblings[:] = [item for item in self.siblings if id(item) not in self.dropped]
+        if self.new_marker:
+            self.siblings.append(self.marker)
+        self.dropped.clear()
+        self.new_marker = False
+
+
+def fit_to_budget(data: dict, max_chars: int) -> str:
+    """
+    Serialize a stripped response, pruning it in place to fit max_chars.
+
+    Pruning is greedy, in this order:
+    1. Comments, deepest replies first and the lowest score first within a
+       depth. Omitted comments are counted in a more_marker() per level.
+    2. Long body and content text, longest first, cut to no less than
+       BUDGET_MIN_TEXT characters plus TRUNCATION_SUFFIX.
+    3. Trailing posts and duplicates. The after cursor moves back to the
+       last post kept.
+    One walk collects the candidates and each edit adjusts a running size,
+    so the tree is serialized only once more at the end. If the parts that
+    cannot be pruned exceed the budget, the output is still over max_chars.
+    """
+    output = json_dumps(data)
+    excess = len(output) - max_chars
+    if excess <= 0:
+        return output
+
+    comments = []  # (depth, score, position, siblings, comment)
+    texts = []  # (container, key)
+    listings = []  # (container, key)
+    threads = []  # (comment list, depth)
+    nodes = [data]
+    while nodes:
+        node = nodes.pop()
+        for key in ("body", "content"):
+            if isinstance(node.get(key), str) and len(node[key]) > BUDGET_MIN_TEXT:
+                texts.append((node, key))
+        for key in ("post", "data"):
+            if isinstance(node.get(key), dict):
+                nodes.append(node[key])
+        for key in ("posts", "duplicates"):
+            if isinstance(node.get(key), list):
+                listings.append((node, key))
+                nodes.extend(item for item in node[key] if isinstance(item, dict))
+        if isinstance(node.get("comments"), list):
+            threads.append((node["comments"], 1))
+
+    while threads:
+        siblings, depth = threads.pop()
+        for position, comment in enumerate(siblings):
+            if not isinstance(comment, dict) or comment.get("kind") == "more":
+                continue
+            comments.append((depth, _comment_score(comment), position, siblings, comment))
+            if isinstance(comment.get("body"), str) and len(comment["body"]) > BUDGET_MIN_TEXT:
+                texts.append((comment, "body"))
+            if isinstance(comment.get("replies"), list):
+                threads.append((comment["replies"], depth + 1))
+
+    # A comment is only dropped after every deeper comment, so its own
+    # replies are already gone and dropped subtrees are never counted twice
+    dropped = set()
+    pruned: dict[int, _PrunedList] = {}
+    comments.sort(key=lambda c: (-c[0], c[1], -c[2]))
+    for _, _, _, siblings, comment in comments:
+        if excess <= 0:
+            break
+        # Apply drops among the comment's replies first so it is measured as it would be output
+        replies = comment.get("replies")
+        if isinstance(replies, list) and id(replies) in pruned:
+            pruned[id(replies)].rebuild()
+        if id(siblings) not in pruned:
+            pruned[id(siblings)] = _PrunedList(siblings)
+        excess -= pruned[id(siblings)].drop(comment)
+        dropped.add(id(comment))
+    for siblings in pruned.values():
+        siblings.rebuild()
+
+    texts.sort(key=lambda t: len(t[0][t[1]]), reverse=True)
+    for container, key in texts:
+        if excess <= 0:
+            break
+        if id(container) in dropped:
+            continue
+        text = container[key]
+        keep = max(BUDGET_MIN_TEXT, len(text) - excess - len(TRUNCATION_SUFFIX))
+        if keep >= len(text):
+            continue
+        truncated = text[:keep] + TRUNCATION_SUFFIX
+        excess -= len(json_dumps(text)) - len(json_dumps(truncated))
+        container[key] = truncated
+
+    for container, key in listings:
+        items = container[key]
+        removed = 0
+        # Keep at least one item so a resumable cursor remains
+        while excess > 0 and len(items) > 1:
+            excess -= len(json_dumps(items.pop())) + 1
+            removed += 1
+        last_id = items[-1].get("id") if isinstance(items[-1], dict) else None
+        if removed and key == "posts" and container.get("after") and last_id:
+            after = f"t3_{last_id}"
+            excess += len(json_dumps(after)) - len(json_dumps(container["after"]))
+            container["after"] = after
+
+    return json_dumps(data)
+
+
+# Keys kept by strip_response, in output order
+RESPONSE_KEYS = (
+    "post", "posts", "comments", "duplicates",
+    "after", "before", "subreddit", "wiki_page", "content", "data",
+)
+
+# Projection schemas for StreamingStripper, mirroring strip_response/strip_post/strip_comment.
+# Map schemas name the schema of each kept key; keys not listed are skipped.
+# List schemas are (item schema, drop the key if the value is not a list).
+KEEP = "keep"
+STREAM_SCHEMAS = {
+    "response": {
+        "post": "post",
+        "posts": ("post", True),
+        "comments": ("comment", True),
+        "duplicates": ("post", True),
+        "after": KEEP,
+        "before": KEEP,
+        "subreddit": KEEP,
+        "wiki_page": KEEP,
+        "content": KEEP,
+        "data": "response",
+    },
+    "post": {**{field: KEEP for field in POST_FIELDS}, "author": "author"},
+    "comment": {
+        **{field: KEEP for field in COMMENT_FIELDS},
+        "author": "author",
+        "replies": ("comment", False),
+    },
+    "author": {"name": KEEP},
+}
+
+
+class StreamingStripper:
+    """
+    Incrementally parse a Redlib JSON body, keeping only what strip_response keeps.
+
+    Feed raw byte chunks to feed() and call close() for the stripped result.
+    Skipped subtrees are never materialized, so peak memory follows the
+    stripped output rather than the raw payload. Requires ijson.
+    """
+
+    def __init__(self):
+        self._events = ijson.sendable_list()
+        self._parser = ijson.basic_parse_coro(self._events, use_float=True)
+        # frames: [container, schema, pending map key]
+        self._stack: list[list] = []
+        self._skip = 0
+        self.result = None
+
+    def feed(self, chunk: bytes):
+        """Parse another chunk of the body."""
+        self._parser.send(chunk)
+        self._process()
+
+    def close(self):
+        """Finish parsing and return the stripped document."""
+        self._parser.close()
+        self._process()
+        return self.result
+
+    def _process(self):
+        for event, value in self._events:
+            if self._skip:
+                if event == "start_map" or event == "start_array":
+                    self._skip += 1
+                elif event == "end_map" or event == "end_array":
+                    self._skip -= 1
+                continue
+
+            if event == "map_key":
+                self._stack[-1][2] = value
+                continue
+
+            if event == "end_map" or event == "end_array":
+                container, schema, _ = self._stack.pop()
+                self._emit(self._finish(container, schema))
+                continue
+
+            schema = self._child_schema()
+            if schema is None:
+                if event == "start_map" or event == "start_array":
+                    self._skip = 1
+                continue
+
+            if event == "start_map":
+                if isinstance(schema, tuple):
+                    if schema[1]:
+                        self._skip = 1
+                        continue
+                    schema = KEEP
+                self._stack.append([{}, schema, None])
+            elif event == "start_array":
+                self._stack.append([[], schema if isinstance(schema, tuple) else KEEP, None])
+            elif isinstance(schema, tuple) and schema[1]:
+                continue
+            else:
+                self._emit(value)
+        del self._events[:]
+
+    def _child_schema(self):
+        """Schema for the next value, or None if it should be skipped."""
+        if not self._stack:
+            return "response"
+        container, schema, key = self._stack[-1]
+        if schema == KEEP:
+            return KEEP
+        if isinstance(container, list):
+            return schema[0]
+        return STREAM_SCHEMAS[schema].get(key)
+
+    def _emit(self, value):
+        if not self._stack:
+            self.result = value
+            return
+        container, _, key = self._stack[-1]
+        if isinstance(container, list):
+            container.append(value)
+        else:
+            container[key] = value
+
+    @staticmethod
+    def _finish(container, schema):
+        if schema == "author":
+            return container.get("name", "")
+        if schema == "response":
+            return {key: container[key] for key in RESPONSE_KEYS if key in container}
+        return container
+
+
+if msgspec is not None:
+    UNSET = msgspec.UNSET
+
+    class Post(msgspec.Struct, omit_defaults=True):
+        """Typed post keeping only POST_FIELDS; unknown fields are skipped at decode time."""
+
+        id: Any = UNSET
+        title: Any = UNSET
+        body: Any = UNSET
+        author: Any = UNSET
+        subreddit: Any = UNSET
+        score: Any = UNSET
+        upvote_ratio: Any = UNSET
+        permalink: Any = UNSET
+        num_comments: Any = UNSET
+        created: Any = UNSET
+        nsfw: Any = UNSET
+        url: Any = UNSET
+        thumbnail: Any = UNSET
+        is_self: Any = UNSET
+        domain: Any = UNSET
+        flair: Any = UNSET
+
+        def __post_init__(self):
+            # Simplify author to just name
+            if isinstance(self.author, dict):
+                self.author = self.author.get("name", "")
+
+    class Comment(msgspec.Struct, omit_defaults=True):
+        """Typed comment keeping only COMMENT_FIELDS, with typed replies."""
+
+        id: Any = UNSET
+        body: Any = UNSET
+        author: Any = UNSET
+        score: Any = UNSET
+        created: Any = UNSET
+        replies: "list[Comment] | None | msgspec.UnsetType" = UNSET
+        kind: Any = UNSET
+
+        def __post_init__(self):
+            if isinstance(self.author, dict):
+                self.author = self.author.get("name", "")
+
+    class RedlibResponse(msgspec.Struct, omit_defaults=True):
+        """Typed Redlib response holding exactly what strip_response keeps."""
+
+        post: "Post | None | msgspec.UnsetType" = UNSET
+        posts: "list[Post] | None | msgspec.UnsetType" = UNSET
+        comments: "list[Comment] | None | msgspec.UnsetType" = UNSET
+        duplicates: "list[Post] | None | msgspec.UnsetType" = UNSET
+        after: Any = UNSET
+        before: Any = UNSET
+        subreddit: Any = UNSET
+        wiki_page: Any = UNSET
+        content: Any = UNSET
+        data: "RedlibResponse | None | msgspec.UnsetType" = UNSET
+
+        def __post_init__(self):
+            # strip_response drops these keys unless they hold a list
+            if self.posts is None:
+                self.posts = UNSET
+            if self.comments is None:
+                self.comments = UNSET
+            if self.duplicates is None:
+                self.duplicates = UNSET
+
+    _response_decoder = msgspec.json.Decoder(RedlibResponse)
+
+
+class StrippedResponse(dict):
+    """A response already in strip_response() form, so stripping it again without options can be skipped."""
+
+
+def decode_stripped(content: bytes) -> StrippedResponse:
+    """
+    Decode a Redlib body straight into its strip_response projection.
+
+    Uses the msgspec models above, so dropped fields are never turned into
+    Python objects. Bodies that don't fit the models fall back to a full
+    parse followed by strip_response. Requires msgspec.
+    """
+    try:
+        return StrippedResponse(msgspec.to_builtins(_response_decoder.decode(content)))
+    except msgspec.ValidationError:
+        return StrippedResponse(strip_response(json_loads(content)))
+
+
 def normalize_path(url: str, redlib_url: str | None = None) -> str:
     """
     Normalize a Reddit/Redlib URL or path to a clean path.
@@ -186,6 +835,55 @@ def normalize_post(post: str, redlib_url: str | None = None) -> str:
     return path
 
 
+def read_config_file() -> dict:
+    """Read ~/.config/redlib/config.json, returning {} if missing or invalid."""
+    config_path = Path.home() / ".config" / "redlib" / "config.json"
+    if config_path.exists():
+        try:
+            config = json.loads(config_path.read_text())
+            if isinstance(config, dict):
+                return config
+        except (json.JSONDecodeError, IOError):
+            pass
+    return {}
+
+
+def config_value(key: str, default: str | None = None, config: dict | None = None) -> str | None:
+    """
+    Look up a setting by name.
+
+    Priority:
+    1. Environment variable
+    2. ~/.config/redlib/config.json (or config, if already read)
+    3. The given default
+    """
+    if value := os.getenv(key):
+        return value
+    value = (read_config_file() if config is None else config).get(key)
+    if value is not None and value != "":
+        return str(value)
+    return default
+
+
+def load_backend_urls() -> list[str]:
+    """
+    Load the list of Redlib instances to spread requests across.
+
+    Priority:
+    1. REDLIB_URLS environment variable (comma-separated)
+    2. REDLIB_URLS in ~/.config/redlib/config.json (list or comma-separated)
+    3. The single URL from load_config()
+    """
+    urls = os.getenv("REDLIB_URLS") or read_config_file().get("REDLIB_URLS")
+    if isinstance(urls, str):
+        urls = urls.split(",")
+    if isinstance(urls, list):
+        urls = [str(url).strip() for url in urls if str(url).strip()]
+        if urls:
+            return urls
+    return [load_config()]
+
+
 def load_config() -> str:
     """
     Load Redlib URL from configuration.
@@ -195,22 +893,53 @@ def load_config() -> str:
     2. ~/.config/redlib/config.json
     3. Default: http://localhost:8080
     """
-    # 1. Environment variable
-    if url := os.getenv("REDLIB_URL"):
-        return url
+    return config_value("REDLIB_URL", "http://localhost:8080")
 
-    # 2. Config file
-    config_path = Path.home() / ".config" / "redlib" / "config.json"
-    if config_path.exists():
-        try:
-            config = json.loads(config_path.read_text())
-            if url := config.get("REDLIB_URL"):
-                return url
-        except (json.JSONDecodeError, IOError):
-            pass
 
-    # 3. Default
-    return "http://localhost:8080"
+def parse_bool(value: str | None) -> bool:
+    """Interpret a config string such as "1", "true" or "yes" as a boolean."""
+    return str(value).strip().lower() in ("1", "true", "yes", "on")
+
+
+def load_client_config() -> dict:
+    """
+    Load HTTP connection pool settings for the Redlib client.
+
+    Each setting is read from the environment first, then from
+    ~/.config/redlib/config.json.
+
+    Settings:
+        REDLIB_MAX_CONNECTIONS: Maximum open connections (default: 100)
+        REDLIB_MAX_KEEPALIVE: Maximum idle keep-alive connections (default: 20)
+        REDLIB_KEEPALIVE_EXPIRY: Seconds before an idle connection is closed (default: 30)
+        REDLIB_HTTP2: Enable HTTP/2 when set to true (requires the h2 package)
+        REDLIB_TIMEOUT: Request timeout in seconds (default: 5)
+        REDLIB_STREAMING: Parse and strip bodies incrementally (requires ijson)
+        REDLIB_TYPED_DECODE: Decode bodies into typed models (requires msgspec;
+            default: false)
+        REDLIB_RETRIES: Retries for failed or 5xx requests (default: 2)
+        REDLIB_RETRY_BACKOFF: Base delay for exponential backoff in seconds (default: 0.2)
+        REDLIB_RETRY_MAX_BACKOFF: Maximum backoff delay in seconds (default: 5)
+        REDLIB_HEDGE: Send a second request when the first exceeds the p95 latency
+        REDLIB_HEALTH_CHECK_PATH: Path probed on each backend (default: /r/all.js)
+        REDLIB_HEALTH_CHECK_INTERVAL: Seconds between health checks, 0 to disable
+            (default: 30; only used with more than one backend)
+    """
+    return {
+        "max_connections": int(config_value("REDLIB_MAX_CONNECTIONS", "100")),
+        "max_keepalive_connections": int(config_value("REDLIB_MAX_KEEPALIVE", "20")),
+        "keepalive_expiry": float(config_value("REDLIB_KEEPALIVE_EXPIRY", "30")),
+        "http2": parse_bool(config_value("REDLIB_HTTP2", "false")),
+        "timeout": float(config_value("REDLIB_TIMEOUT", "5")),
+        "streaming": parse_bool(config_value("REDLIB_STREAMING", "false")),
+        "typed_decode": parse_bool(config_value("REDLIB_TYPED_DECODE", "false")),
+        "retries": int(config_value("REDLIB_RETRIES", "2")),
+        "retry_backoff": float(config_value("REDLIB_RETRY_BACKOFF", "0.2")),
+        "retry_max_backoff": float(config_value("REDLIB_RETRY_MAX_BACKOFF", "5")),
+        "hedge": parse_bool(config_value("REDLIB_HEDGE", "false")),
+        "health_check_path": config_value("REDLIB_HEALTH_CHECK_PATH", "/r/all.js"),
+        "health_check_interval": float(config_value("REDLIB_HEALTH_CHECK_INTERVAL", "30")),
+    }
 
 
 # Configure logging early so it's available for load_access_config
@@ -269,63 +998,1894 @@ def load_access_config() -> dict | None:
     }
 
 
+def load_cache_config(prefix: str = "REDLIB_CACHE") -> dict | None:
+    """
+    Load response cache settings.
+
+    Returns None if the cache is disabled (<prefix>_ENTRIES=0). The same
+    settings exist for the tool output cache under REDLIB_OUTPUT_CACHE.
+
+    Settings:
+        REDLIB_CACHE_ENTRIES: Maximum cached responses (default: 1024)
+        REDLIB_CACHE_MAX_BYTES: Maximum total size of cached bodies (default: 64 MiB)
+        REDLIB_CACHE_TTL: TTL in seconds for paths not in CACHE_TTLS (default: 60)
+        REDLIB_CACHE_STALE_TTL: Seconds past expiry a STALE_WHILE_REVALIDATE_PATHS
+            response may still be served while it refreshes (default: 300;
+            the output cache defaults to 0)
+    """
+    max_entries = int(config_value(f"{prefix}_ENTRIES", "1024"))
+    if max_entries <= 0:
+        return None
+
+    return {
+        "max_entries": max_entries,
+        "max_bytes": int(config_value(f"{prefix}_MAX_BYTES", str(64 * 1024 * 1024))),
+        "default_ttl": float(config_value(f"{prefix}_TTL", str(DEFAULT_CACHE_TTL))),
+        "stale_ttl": float(config_value(f"{prefix}_STALE_TTL", "300" if prefix == "REDLIB_CACHE" else "0")),
+    }
+
+
+class CacheEntry:
+    """A cached value with its expiry time and HTTP validators."""
+
+    __slots__ = ("value", "size", "expires_at", "etag", "last_modified")
+
+    def __init__(self, value, size: int, expires_at: float, etag: str | None = None,
+                 last_modified: str | None = None):
+        self.value = value
+        self.size = size
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+    def conditional_headers(self) -> dict:
+        """Headers that let Redlib answer 304 Not Modified if the body is unchanged."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    In-process TTL cache for Redlib responses with LRU eviction.
+
+    Bounded by both entry count and total body size. Entries expire after a
+    per-endpoint TTL chosen from CACHE_TTLS. Expired entries are kept while
+    they have HTTP validators (for conditional requests) or are within
+    stale_ttl of expiry (for stale-while-revalidate). Cached values are
+    shared between callers and must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        default_ttl: float = DEFAULT_CACHE_TTL,
+        ttls: list[tuple[re.Pattern, float]] | None = None,
+        stale_ttl: float = 0,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.ttls = CACHE_TTLS if ttls is None else ttls
+        self.stale_ttl = stale_ttl
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def key(path: str, params: dict | None = None) -> str:
+        """Build a cache key from a path and its query params (order-insensitive)."""
+        path = path.rstrip("/") or "/"
+        if not params:
+            return path
+        items = sorted((k, str(v)) for k, v in params.items() if v is not None)
+        return f"{path}?{urlencode(items)}" if items else path
+
+    def ttl_for(self, path: str) -> float:
+        """Return the TTL for a request path."""
+        for pattern, ttl in self.ttls:
+            if pattern.search(path):
+                return ttl
+        return self.default_ttl
+
+    def get(self, key: str):
+        """Return the cached value for key, or None on miss or expiry."""
+        entry = self.lookup(key)
+        return entry.value if entry is not None and entry.fresh else None
+
+    def lookup(self, key: str) -> CacheEntry | None:
+        """
+        Return the entry for key, fresh or stale, counting a hit only if fresh.
+
+        Returns None if there is no entry or it is expired beyond use.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        if entry.fresh:
+            self.hits += 1
+            return entry
+        self.expirations += 1
+        self.misses += 1
+        if not self._retainable(entry):
+            self._remove(key)
+            return None
+        return entry
+
+    def peek(self, key: str) -> CacheEntry | None:
+        """Return the entry for key without touching counters or LRU order."""
+        return self._entries.get(key)
+
+    def set(self, key: str, value, size: int, ttl: float, etag: str | None = None,
+            last_modified: str | None = None):
+        """Store a value, evicting least-recently-used entries to stay within bounds."""
+        if ttl <= 0 or size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = CacheEntry(value, size, time.monotonic() + ttl, etag, last_modified)
+        self.bytes += size
+        while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def refresh(self, key: str, ttl: float):
+        """Mark an entry fresh again, e.g. after a 304 Not Modified."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.expires_at = time.monotonic() + ttl
+            self._entries.move_to_end(key)
+
+    def discard(self, match: Callable[[str], bool]) -> int:
+        """Drop every entry whose key satisfies match; return how many were dropped."""
+        keys = [key for key in self._entries if match(key)]
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def clear(self):
+        """Drop all entries (counters are kept)."""
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict:
+        """Return hit/miss/eviction counters and current occupancy."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_hits": self.stale_hits,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+        }
+
+    def _retainable(self, entry: CacheEntry) -> bool:
+        """Whether an expired entry is still useful for revalidation or stale serving."""
+        if entry.etag or entry.last_modified:
+            return True
+        return time.monotonic() < entry.expires_at + self.stale_ttl
+
+    def _remove(self, key: str):
+        self.bytes -= self._entries.pop(key).size
+
+
+def load_disk_cache_config() -> dict | None:
+    """
+    Load on-disk cache settings.
+
+    Returns None unless REDLIB_DISK_CACHE is enabled.
+
+    Settings:
+        REDLIB_DISK_CACHE: Enable the shared SQLite cache (default: false)
+        REDLIB_CACHE_DIR: Directory for the cache database (default: ~/.config/redlib)
+        REDLIB_DISK_CACHE_MAX_BYTES: Maximum total size of cached bodies (default: 256 MiB)
+    """
+    if not parse_bool(config_value("REDLIB_DISK_CACHE", "false")):
+        return None
+
+    cache_dir = config_value("REDLIB_CACHE_DIR") or str(Path.home() / ".config" / "redlib")
+    return {
+        "path": Path(cache_dir).expanduser() / DISK_CACHE_FILE,
+        "max_bytes": int(config_value("REDLIB_DISK_CACHE_MAX_BYTES", str(256 * 1024 * 1024))),
+    }
+
+
+class DiskCache:
+    """
+    Persistent SQLite cache shared by server processes and across restarts.
+
+    RedlibClient uses it as an L2 behind the in-memory ResponseCache. The
+    database runs in WAL mode so workers can read while another writes.
+    Expiry uses wall-clock time so it means the same thing in every process.
+    compact() drops expired rows, then the oldest rows beyond max_bytes,
+    and runs every DISK_CACHE_COMPACT_EVERY writes. Methods block, so
+    callers on the event loop should run them in a thread.
+    """
+
+    def __init__(self, path: str | Path, max_bytes: int = 256 * 1024 * 1024):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), timeout=5, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY,"
+            " value BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " written_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_written_at ON entries (written_at)")
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> tuple[bytes, float] | None:
+        """Return (body, expires_at) for a fresh entry, or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, expires_at FROM entries WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return bytes(row[0]), row[1]
+
+    def set(self, key: str, value: bytes, ttl: float):
+        """Store a body for ttl seconds."""
+        if ttl <= 0 or len(value) > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, expires_at, written_at) VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now + ttl, now),
+            )
+            self._writes += 1
+            compact = self._writes % DISK_CACHE_COMPACT_EVERY == 0
+        if compact:
+            self.compact()
+
+    def compact(self):
+        """Delete expired rows, trim to max_bytes (oldest first), and reclaim free pages."""
+        with self._lock:
+            self._db.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+            total = 0
+            cutoff = None
+            for written_at, size in self._db.execute(
+                "SELECT written_at, size FROM entries ORDER BY written_at DESC"
+            ):
+                total += size
+                if total > self.max_bytes:
+                    cutoff = written_at
+                    break
+            if cutoff is not None:
+                self._db.execute("DELETE FROM entries WHERE written_at <= ?", (cutoff,))
+            self._db.execute("PRAGMA incremental_vacuum")
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": size}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def load_offload_config() -> dict | None:
+    """
+    Load settings for moving strip/serialize work for large responses off the event loop.
+
+    Returns None if REDLIB_OFFLOAD_THRESHOLD is 0.
+
+    Settings:
+        REDLIB_OFFLOAD_THRESHOLD: Response size in bytes above which work is offloaded (default: 1 MiB)
+        REDLIB_OFFLOAD_WORKERS: Pool size (default: 2)
+        REDLIB_OFFLOAD_POOL: "thread" or "process" (default: thread)
+    """
+    threshold = int(config_value("REDLIB_OFFLOAD_THRESHOLD", str(1024 * 1024)))
+    if threshold <= 0:
+        return None
+
+    pool = config_value("REDLIB_OFFLOAD_POOL", "thread").lower()
+    if pool not in ("thread", "process"):
+        logger.warning(f"Unknown offload pool {pool!r} - using threads")
+        pool = "thread"
+    return {
+        "threshold": threshold,
+        "workers": int(config_value("REDLIB_OFFLOAD_WORKERS", "2")),
+        "pool": pool,
+    }
+
+
+class Offloader:
+    """
+    Run CPU-heavy work for large responses in a thread or process pool.
+
+    Threads keep the event loop responsive, since the interpreter switches
+    away from long-running Python code. A process pool also spreads
+    work across cores, but each payload is pickled to the worker and back,
+    so it only pays off for very large responses.
+    """
+
+    def __init__(self, threshold: int, workers: int = 2, pool: str = "thread"):
+        self.threshold = threshold
+        self.workers = workers
+        self.pool = pool
+        self.executor: Executor | None = None
+        self.offloaded = 0
+
+    def open(self) -> Executor:
+        """Start the pool if it is not already running."""
+        if self.executor is None:
+            executor_class = ProcessPoolExecutor if self.pool == "process" else ThreadPoolExecutor
+            self.executor = executor_class(max_workers=self.workers)
+        return self.executor
+
+    def should_offload(self, size: int | None) -> bool:
+        return size is not None and size >= self.threshold
+
+    async def run(self, func: Callable, *args):
+        """Run func(*args) in the pool and wait for the result."""
+        self.offloaded += 1
+        if self.pool == "thread":
+            # Carry the caller's context (e.g. the current tracing span) into the worker thread
+            func = functools.partial(contextvars.copy_context().run, func)
+        return await asyncio.get_running_loop().run_in_executor(self.open(), func, *args)
+
+    def shutdown(self):
+        """Stop the pool's workers. A later run() starts a new pool."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+
+def load_rate_limit_config() -> dict | None:
+    """
+    Load upstream rate limiting settings.
+
+    Returns None if both the rate limit and the concurrency cap are disabled (0).
+    The limits are enforced per process; with MCP_SERVER_WORKERS > 1 they are
+    divided between the workers first (see split_rate_limits).
+
+    Settings:
+        REDLIB_RATE_LIMIT: Sustained requests per second to Redlib (default: 10)
+        REDLIB_RATE_BURST: Requests allowed in a burst above the rate (default: 20)
+        REDLIB_MAX_CONCURRENCY: Maximum requests in flight to Redlib (default: 16)
+    """
+    rate = float(config_value("REDLIB_RATE_LIMIT", "10"))
+    max_concurrency = int(config_value("REDLIB_MAX_CONCURRENCY", "16"))
+    if rate <= 0 and max_concurrency <= 0:
+        return None
+
+    return {
+        "rate": rate,
+        "burst": int(config_value("REDLIB_RATE_BURST", "20")),
+        "max_concurrency": max_concurrency,
+    }
+
+
+def split_rate_limits(workers: int):
+    """
+    Divide the upstream rate limits between worker processes.
+
+    Every worker builds its own RateLimiter, so the configured totals are
+    split evenly and written to the environment the workers inherit. Burst
+    and concurrency are kept at 1 or more per worker.
+    """
+    config = load_rate_limit_config()
+    if config is None or workers <= 1:
+        return
+    rate = config["rate"] / workers if config["rate"] > 0 else 0
+    burst = max(config["burst"] // workers, 1)
+    max_concurrency = max(config["max_concurrency"] // workers, 1) if config["max_concurrency"] > 0 else 0
+    os.environ["REDLIB_RATE_LIMIT"] = str(rate)
+    os.environ["REDLIB_RATE_BURST"] = str(burst)
+    os.environ["REDLIB_MAX_CONCURRENCY"] = str(max_concurrency)
+    logger.warning(
+        f"Upstream rate limits are per worker - splitting them across {workers} workers "
+        f"(rate={rate:g}/s, burst={burst}, max_concurrency={max_concurrency} each)"
+    )
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header (seconds or HTTP date) into a delay capped at MAX_RETRY_AFTER."""
+    if not value:
+        return None
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            delay = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(delay, 0.0), MAX_RETRY_AFTER)
+
+
+class RateLimiter:
+    """
+    Token bucket plus concurrency cap for requests to Redlib.
+
+    Callers queue in slot() until both a concurrency slot and a token are
+    available. block_for() pauses the whole queue, e.g. for a Retry-After
+    header. A rate or max_concurrency of 0 disables that limit.
+    """
+
+    def __init__(self, rate: float = 10.0, burst: int = 20, max_concurrency: int = 16):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency > 0 else None
+        # Serializes token takers so the queue drains in arrival order
+        self._lock = asyncio.Lock()
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self.waiting = 0
+        self.in_flight = 0
+        self.acquired = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @asynccontextmanager
+    async def slot(self):
+        """Wait for permission to send one request and hold it while the request runs."""
+        start = time.monotonic()
+        self.waiting += 1
+        try:
+            if self._semaphore is not None:
+                await self._semaphore.acquire()
+            try:
+                await self._take_token()
+            except BaseException:
+                if self._semaphore is not None:
+                    self._semaphore.release()
+                raise
+        finally:
+            self.waiting -= 1
+
+        waited = time.monotonic() - start
+        self.acquired += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def try_acquire(self) -> bool:
+        """
+        Take a slot and a token only if both are free right now.
+
+        For optional requests such as hedges, which should be skipped rather
+        than queued. Call release() when the request finishes.
+        """
+        now = time.monotonic()
+        if self._lock.locked() or now < self._blocked_until:
+            return False
+        if self._semaphore is not None and self._semaphore.locked():
+            return False
+        if self.rate > 0:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+        if self._semaphore is not None:
+            # Free and uncontended, so this does not wait
+            await self._semaphore.acquire()
+        self.acquired += 1
+        self.in_flight += 1
+        return True
+
+    def release(self):
+        """Give back a slot taken by slot() or try_acquire()."""
+        self.in_flight -= 1
+        if self._semaphore is not None:
+            self._semaphore.release()
+
+    def block_for(self, seconds: float):
+        """Hold every queued request for at least the given number of seconds."""
+        self.throttled += 1
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    async def _take_token(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                if self.rate <= 0:
+                    return
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def stats(self) -> dict:
+        """Return queue depth, wait times and throttling counters."""
+        return {
+            "queue_depth": self.waiting,
+            "in_flight": self.in_flight,
+            "acquired": self.acquired,
+            "throttled": self.throttled,
+            "total_wait_seconds": self.total_wait,
+            "max_wait_seconds": self.max_wait,
+        }
+
+
+class Backend:
+    """
+    One Redlib instance in a RedlibClient's pool.
+
+    Tracks outstanding requests and an EWMA of latency for load balancing.
+    BACKEND_EJECT_FAILURES consecutive failures eject it; it is tried again
+    after BACKEND_EJECT_SECONDS or as soon as a health check passes.
+    """
+
+    def __init__(self, url: str):
+        self.url = url.rstrip("/")
+        self.outstanding = 0
+        self.ewma: float | None = None
+        self.healthy = True
+        self.failures = 0
+        self.retry_at = 0.0
+        self.requests = 0
+        self.errors = 0
+
+    @property
+    def available(self) -> bool:
+        """Whether requests may be routed here (healthy, or due for another try)."""
+        return self.healthy or time.monotonic() >= self.retry_at
+
+    def score(self) -> float:
+        """Expected cost of sending one more request here; lower is better."""
+        # Untried backends score near zero so they get sampled
+        return (self.outstanding + 1) * (self.ewma if self.ewma is not None else 1e-6)
+
+    def record_success(self, latency: float):
+        self.requests += 1
+        if self.ewma is None:
+            self.ewma = latency
+        else:
+            self.ewma = BACKEND_EWMA_ALPHA * latency + (1 - BACKEND_EWMA_ALPHA) * self.ewma
+        self.failures = 0
+        if not self.healthy:
+            self.readmit()
+
+    def record_failure(self):
+        self.requests += 1
+        self.errors += 1
+        self.failures += 1
+        if self.failures >= BACKEND_EJECT_FAILURES:
+            self.eject(f"{self.failures} consecutive failures")
+
+    def eject(self, reason: str):
+        """Stop routing requests here for BACKEND_EJECT_SECONDS."""
+        if self.healthy:
+            logger.warning(f"Ejecting Redlib backend {self.url}: {reason}")
+        self.healthy = False
+        self.retry_at = time.monotonic() + BACKEND_EJECT_SECONDS
+
+    def readmit(self):
+        """Route requests here again."""
+        if not self.healthy:
+            logger.info(f"Readmitting Redlib backend {self.url}")
+        self.healthy = True
+        self.failures = 0
+
+    def stats(self) -> dict:
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "outstanding": self.outstanding,
+            "ewma_seconds": self.ewma,
+            "requests": self.requests,
+            "errors": self.errors,
+        }
+
+
 class RedlibClient:
-    """HTTP client for Redlib's JSON API."""
+    """
+    HTTP client for Redlib's JSON API.
+
+    Holds a long-lived httpx connection pool so keep-alive connections are
+    reused across tool calls. The pool is created on first use (or by
+    open()) and released by aclose().
+
+    Concurrent requests for the same path and params are coalesced into a
+    single upstream fetch whose parsed result is shared by every caller.
+
+    With streaming or typed decoding enabled, get() returns the
+    strip_response projection instead of the raw payload.
+
+    Upstream requests are governed by an optional RateLimiter. A 429
+    response with Retry-After pauses the limiter's queue and the request
+    is queued again once.
+
+    Transport errors and RETRY_STATUSES are retried up to `retries` times
+    with full-jitter exponential backoff. With hedging on, a second request
+    is sent if the first outlasts the recent p95 latency, and whichever
+    finishes first wins.
+
+    base_url may be a list of Redlib instances. Each request goes to the
+    available Backend with the lowest outstanding-requests x EWMA-latency
+    score, and a background task health-checks the pool (see
+    start_health_checks).
+
+    ETag/Last-Modified validators are stored with cached responses and sent
+    as If-None-Match/If-Modified-Since when an entry expires; a 304 renews
+    the cached body. For STALE_WHILE_REVALIDATE_PATHS, an expired entry is
+    returned at once while a background fetch refreshes it; on_refresh is
+    called with the cache key once that fetch succeeds.
+
+    An optional DiskCache acts as a shared L2: it is checked before going
+    upstream and written after every successful fetch.
+    """
 
-    def __init__(self, base_url: str):
-        self.base_url = base_url.rstrip("/")
+    def __init__(
+        self,
+        base_url: str | list[str],
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        timeout: float = 5.0,
+        cache: ResponseCache | None = None,
+        streaming: bool = False,
+        typed_decode: bool = False,
+        limiter: RateLimiter | None = None,
+        retries: int = 0,
+        retry_backoff: float = 0.2,
+        retry_max_backoff: float = 5.0,
+        hedge: bool = False,
+        health_check_path: str = "/r/all.js",
+        health_check_interval: float = 30.0,
+        disk_cache: DiskCache | None = None,
+        on_refresh: Callable[[str], None] | None = None,
+    ):
+        urls = [base_url] if isinstance(base_url, str) else list(base_url)
+        self.backends = [Backend(url) for url in urls]
+        self.base_url = self.backends[0].url
+        self.health_check_path = health_check_path
+        self.health_check_interval = health_check_interval
+        self._health_task: asyncio.Task | None = None
+        self.cache = cache
+        self.disk_cache = disk_cache
+        self.on_refresh = on_refresh
+        self.limiter = limiter
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.retry_max_backoff = retry_max_backoff
+        self.hedge = hedge
+        self._latencies: deque[float] = deque(maxlen=HEDGE_SAMPLES)
+        self._sizes: OrderedDict[str, int] = OrderedDict()
+        self.retried = 0
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self.not_modified = 0
+        self.revalidations = 0
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+        self.http2 = http2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("REDLIB_HTTP2 requested but h2 is not installed - using HTTP/1.1")
+                self.http2 = False
+        self.streaming = streaming
+        if streaming and ijson is None:
+            logger.warning("REDLIB_STREAMING requested but ijson is not installed - parsing whole bodies")
+            self.streaming = False
+        self.typed_decode = typed_decode and msgspec is not None
+        if typed_decode and msgspec is None:
+            logger.warning("REDLIB_TYPED_DECODE requested but msgspec is not installed - parsing whole bodies")
+        self._http: httpx.AsyncClient | None = None
+        # cache key -> in-flight fetch shared by concurrent callers
+        self._inflight: dict[str, asyncio.Task] = {}
+        self.coalesced = 0
+
+    def open(self) -> httpx.AsyncClient:
+        """Create the connection pool if it is not already open."""
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                limits=self.limits,
+                timeout=self.timeout,
+                http2=self.http2,
+            )
+        return self._http
+
+    async def aclose(self):
+        """Stop health checks, close the connection pool and drop keep-alive connections."""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        if self.disk_cache is not None:
+            self.disk_cache.close()
+            self.disk_cache = None
 
     async def get(self, path: str, params: dict | None = None) -> dict:
         """
         Fetch JSON from a Redlib endpoint.
 
-        Appends .js to the path to get JSON response.
+        Appends .js to the path to get JSON response. Successful responses
+        are served from the response cache while fresh, and identical
+        in-flight requests share one upstream fetch.
+        """
+        with span("redlib.get", **{"redlib.path": path}):
+            return await self._get(path, params)
+
+    async def _get(self, path: str, params: dict | None) -> dict:
+        cache_key = ResponseCache.key(path, params)
+        if self.cache is not None:
+            entry = self.cache.lookup(cache_key)
+            if entry is not None:
+                if entry.fresh:
+                    set_span_attribute("redlib.cache", "hit")
+                    return entry.value
+                if self.cache.stale_ttl > 0 and entry.expires_at + self.cache.stale_ttl > time.monotonic() \
+                        and any(pattern.search(path) for pattern in STALE_WHILE_REVALIDATE_PATHS):
+                    self.cache.stale_hits += 1
+                    set_span_attribute("redlib.cache", "stale")
+                    if cache_key not in self._inflight:
+                        self.revalidations += 1
+                        self._start_fetch(path, params, cache_key).add_done_callback(
+                            lambda t: self._background_refreshed(cache_key, t)
+                        )
+                    return entry.value
+
+        task = self._inflight.get(cache_key)
+        if task is None:
+            set_span_attribute("redlib.cache", "miss")
+            task = self._start_fetch(path, params, cache_key)
+        else:
+            set_span_attribute("redlib.cache", "coalesced")
+            self.coalesced += 1
+
+        # Shield so one caller being cancelled doesn't cancel the shared fetch
+        return await asyncio.shield(task)
+
+    def _start_fetch(self, path: str, params: dict | None, cache_key: str) -> asyncio.Task:
+        """Start an upstream fetch and register it for coalescing."""
+        task = asyncio.ensure_future(self._fetch(path, params, cache_key))
+        self._inflight[cache_key] = task
+        task.add_done_callback(lambda t: self._forget(cache_key, t))
+        return task
+
+    def _forget(self, cache_key: str, task: asyncio.Task):
+        """Remove a finished fetch from the in-flight table."""
+        if self._inflight.get(cache_key) is task:
+            del self._inflight[cache_key]
+
+    def _background_refreshed(self, cache_key: str, task: asyncio.Task):
+        """Log a failed stale-while-revalidate fetch, or report a successful one."""
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            logger.warning(f"Background refresh failed: {task.exception()}")
+        elif self.on_refresh is not None:
+            self.on_refresh(cache_key)
+
+    def expires_at(self, path: str, params: dict | None, data) -> float | None:
+        """
+        When the cached response that get() returned as data stops being fresh.
+
+        Returns a time.monotonic() value, already past if data was served
+        stale, or None if data is not the cached entry (no response cache,
+        or the response was not cacheable).
+        """
+        if self.cache is None:
+            return None
+        entry = self.cache.peek(ResponseCache.key(path, params))
+        if entry is None or entry.value is not data:
+            return None
+        return entry.expires_at
+
+    async def _fetch(self, path: str, params: dict | None, cache_key: str) -> dict:
+        """Perform the upstream request and populate the cache."""
+        with span("redlib.fetch", **{"redlib.path": path}):
+            return await self._fetch_once(path, params, cache_key)
+
+    async def _fetch_once(self, path: str, params: dict | None, cache_key: str) -> dict:
+        if self.disk_cache is not None:
+            cached = await self._disk_get(cache_key)
+            if cached is not None:
+                set_span_attribute("redlib.disk_cache", "hit")
+                body, expires_at = cached
+                data = json_loads(body)
+                self._record_size(cache_key, len(body))
+                if self.cache is not None:
+                    self.cache.set(cache_key, data, len(body), expires_at - time.time())
+                return data
+
+        # Validators of an expired entry make this a conditional request
+        entry = self.cache.peek(cache_key) if self.cache is not None else None
+        headers = entry.conditional_headers() if entry is not None else None
+
+        attempt = 0
+        requeued = False
+        pool_wait = 0.0
+        while True:
+            try:
+                wait_start = time.perf_counter()
+                async with self.limiter.slot() if self.limiter is not None else nullcontext():
+                    pool_wait += time.perf_counter() - wait_start
+                    data, size, validators = await self._send(path, params, headers)
+                break
+            except (httpx.HTTPStatusError, httpx.TransportError) as e:
+                retry_after = None
+                if isinstance(e, httpx.HTTPStatusError):
+                    retry_after = parse_retry_after(e.response.headers.get("Retry-After"))
+                    if e.response.status_code == 429 and retry_after is not None and self.limiter and not requeued:
+                        # Pause the shared queue; this request waits in it like everyone else
+                        logger.warning(f"Redlib rate limited {path}, pausing requests for {retry_after:.1f}s")
+                        self.limiter.block_for(retry_after)
+                        requeued = True
+                        continue
+
+                delay = self._retry_delay(e, attempt, retry_after)
+                if delay is None:
+                    raise
+                attempt += 1
+                self.retried += 1
+                logger.info(f"Retrying {path} in {delay:.2f}s (attempt {attempt}/{self.retries}): {e}")
+                await asyncio.sleep(delay)
+
+        set_span_attribute("redlib.pool_wait_seconds", pool_wait)
+        set_span_attribute("redlib.retries", attempt)
+        if data is NOT_MODIFIED:
+            set_span_attribute("redlib.not_modified", True)
+            self.not_modified += 1
+            self.cache.refresh(cache_key, self.cache.ttl_for(path))
+            data = entry.value
+            size = entry.size
+        elif self.cache is not None:
+            etag, last_modified = validators
+            self.cache.set(cache_key, data, size, self.cache.ttl_for(path), etag, last_modified)
+
+        self._record_size(cache_key, size)
+        if self.disk_cache is not None:
+            ttl = self.cache.ttl_for(path) if self.cache is not None else DEFAULT_CACHE_TTL
+            await self._disk_set(cache_key, data, ttl)
+        return data
+
+    def _record_size(self, cache_key: str, size: int):
+        self._sizes[cache_key] = size
+        self._sizes.move_to_end(cache_key)
+        if len(self._sizes) > RESPONSE_SIZES_MAX:
+            self._sizes.popitem(last=False)
+
+    def response_size(self, path: str, params: dict | None = None) -> int | None:
+        """Body size in bytes of the latest response for a request, if known."""
+        return self._sizes.get(ResponseCache.key(path, params))
+
+    async def _disk_get(self, cache_key: str) -> tuple[bytes, float] | None:
+        """Read from the disk cache in a thread; errors count as a miss."""
+        try:
+            return await asyncio.to_thread(self.disk_cache.get, cache_key)
+        except sqlite3.Error as e:
+            logger.warning(f"Disk cache read failed: {e}")
+            return None
+
+    async def _disk_set(self, cache_key: str, data, ttl: float):
+        """Write to the disk cache in a thread; errors are logged and ignored."""
+        try:
+            await asyncio.to_thread(self.disk_cache.set, cache_key, json_dumps(data).encode(), ttl)
+        except sqlite3.Error as e:
+            logger.warning(f"Disk cache write failed: {e}")
+
+    def _retry_delay(self, error: Exception, attempt: int, retry_after: float | None) -> float | None:
+        """Return the delay before retrying, or None if the error should be raised."""
+        if attempt >= self.retries:
+            return None
+        if isinstance(error, httpx.HTTPStatusError) and error.response.status_code not in RETRY_STATUSES:
+            return None
+        if retry_after is not None:
+            return retry_after
+        # Full jitter: uniform over [0, capped exponential backoff]
+        return random.uniform(0, min(self.retry_max_backoff, self.retry_backoff * 2 ** attempt))
+
+    def hedge_delay(self) -> float | None:
+        """Return the p95 of recent latencies, or None until enough samples exist."""
+        if len(self._latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self._latencies)
+        return max(HEDGE_MIN_DELAY, ordered[int(len(ordered) * 0.95) - 1])
+
+    async def _send(self, path: str, params: dict | None, headers: dict | None = None) -> tuple:
+        """Send a request, hedging it with a second one if it is slower than usual."""
+        delay = self.hedge_delay() if self.hedge else None
+        # Don't add hedges while other requests are queued for the limiter
+        if delay is None or (self.limiter is not None and self.limiter.waiting):
+            return await self._timed_request(path, params, headers)
+
+        primary = asyncio.ensure_future(self._timed_request(path, params, headers))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+
+        # The hedge needs its own limiter slot and token; skip it rather than wait
+        if self.limiter is not None and not await self.limiter.try_acquire():
+            return await primary
+
+        self.hedges_sent += 1
+        # The primary's backend now has an outstanding request, so the hedge
+        # prefers another instance when there is one
+        hedge = asyncio.ensure_future(self._hedge_request(path, params, headers))
+        pending = {primary, hedge}
+        try:
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedges_won += 1
+                        return task.result()
+                if not pending:
+                    # Both failed; surface the primary's error
+                    return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _hedge_request(self, path: str, params: dict | None, headers: dict | None = None) -> tuple:
+        """Send a hedge, releasing the limiter slot taken for it in _send when done or cancelled."""
+        try:
+            return await self._timed_request(path, params, headers)
+        finally:
+            if self.limiter is not None:
+                self.limiter.release()
+
+    def pick_backend(self) -> Backend:
+        """Choose the available backend with the lowest score (all of them if none is available)."""
+        candidates = [b for b in self.backends if b.available] or self.backends
+        if len(candidates) == 1:
+            return candidates[0]
+        best = min(b.score() for b in candidates)
+        return random.choice([b for b in candidates if b.score() == best])
+
+    async def _timed_request(self, path: str, params: dict | None, headers: dict | None = None) -> tuple:
+        """Send one request to a chosen backend, recording its latency and health."""
+        backend = self.pick_backend()
+        backend.outstanding += 1
+        start = time.monotonic()
+        try:
+            with span("redlib.request", **{"redlib.backend": backend.url, "redlib.path": path}):
+                result = await self._request(f"{backend.url}{path}.js", params, headers)
+        except httpx.TransportError:
+            backend.record_failure()
+            record_upstream_status("error")
+            raise
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code >= 500:
+                backend.record_failure()
+            raise
+        finally:
+            backend.outstanding -= 1
+        latency = time.monotonic() - start
+        backend.record_success(latency)
+        self._latencies.append(latency)
+        return result
+
+    def start_health_checks(self):
+        """Start the background health check loop (only with more than one backend)."""
+        if len(self.backends) > 1 and self.health_check_interval > 0 and self._health_task is None:
+            self._health_task = asyncio.create_task(self._health_loop())
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            await self.check_health()
+
+    async def check_health(self):
+        """Probe every backend, ejecting failures and readmitting recoveries."""
+        async def probe(backend: Backend):
+            try:
+                response = await self.open().get(f"{backend.url}{self.health_check_path}")
+                response.raise_for_status()
+            except httpx.HTTPError as e:
+                backend.eject(f"health check failed: {e}")
+            else:
+                backend.readmit()
+
+        await asyncio.gather(*(probe(backend) for backend in self.backends))
+
+    async def _request(self, url: str, params: dict | None, headers: dict | None = None) -> tuple:
         """
-        url = f"{self.base_url}{path}.js"
+        Send one request.
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params)
+        Returns (parsed data, body size in bytes, (etag, last_modified)), with
+        NOT_MODIFIED as the data for a 304 response.
+        """
+        if self.streaming:
+            return await self._fetch_streaming(url, params, headers)
+
+        response = await self.open().get(url, params=params, headers=headers)
+        record_upstream_status(response.status_code)
+        set_span_attribute("http.response.status_code", response.status_code)
+        if response.status_code == 304:
+            return NOT_MODIFIED, 0, self._validators(response)
+        response.raise_for_status()
+        if self.typed_decode:
+            data = decode_stripped(response.content)
+        else:
+            data = json_loads(response.content)
+        return data, len(response.content), self._validators(response)
+
+    async def _fetch_streaming(self, url: str, params: dict | None, headers: dict | None = None) -> tuple:
+        """Stream the body through StreamingStripper; same return value as _request."""
+        async with self.open().stream("GET", url, params=params, headers=headers) as response:
+            record_upstream_status(response.status_code)
+            set_span_attribute("http.response.status_code", response.status_code)
+            if response.status_code == 304:
+                return NOT_MODIFIED, 0, self._validators(response)
             response.raise_for_status()
-            return response.json()
+            stripper = StreamingStripper()
+            size = 0
+            async for chunk in response.aiter_bytes():
+                size += len(chunk)
+                stripper.feed(chunk)
+            return stripper.close(), size, self._validators(response)
 
+    @staticmethod
+    def _validators(response: httpx.Response) -> tuple[str | None, str | None]:
+        return response.headers.get("ETag"), response.headers.get("Last-Modified")
+
+
+def load_tracing_config() -> dict | None:
+    """
+    Load OpenTelemetry tracing settings.
+
+    Returns None unless REDLIB_TRACING is set.
+
+    Settings:
+        REDLIB_TRACING: Span exporter - "otlp" (a collector, configured by the
+            standard OTEL_EXPORTER_OTLP_* variables) or "file"
+        REDLIB_TRACING_FILE: JSON-lines file for the file exporter
+            (default: ~/.config/redlib/traces.jsonl)
+    """
+    exporter = config_value("REDLIB_TRACING", "").lower()
+    if not exporter:
+        return None
+    if exporter not in ("otlp", "file"):
+        logger.warning(f"Unknown tracing exporter {exporter!r} - tracing disabled")
+        return None
+
+    default_file = str(Path.home() / ".config" / "redlib" / "traces.jsonl")
+    return {
+        "exporter": exporter,
+        "path": Path(config_value("REDLIB_TRACING_FILE", default_file)).expanduser(),
+    }
+
+
+# Tracer for spans around tools, fetches, stripping and serialization (None = tracing off)
+tracer = None
+tracer_provider = None
+# Output file of the file exporter, closed by shutdown_tracing()
+trace_file = None
+
+
+def init_tracing(config: dict | None) -> bool:
+    """Set up the tracer from load_tracing_config() output. Returns whether tracing is on."""
+    global tracer, tracer_provider, trace_file
+    if config is None or tracer is not None:
+        return tracer is not None
+    if trace is None:
+        logger.warning("REDLIB_TRACING needs opentelemetry-sdk (install the tracing extra)")
+        return False
+
+    if config["exporter"] == "otlp":
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError:
+            logger.warning("REDLIB_TRACING=otlp needs opentelemetry-exporter-otlp-proto-http")
+            return False
+        exporter = OTLPSpanExporter()
+    else:
+        config["path"].parent.mkdir(parents=True, exist_ok=True)
+        trace_file = open(config["path"], "a")
+        exporter = ConsoleSpanExporter(
+            out=trace_file,
+            formatter=lambda finished: finished.to_json(indent=None) + "\n",
+        )
+
+    tracer_provider = TracerProvider(resource=Resource.create({"service.name": "redlib-mcp"}))
+    tracer_provider.add_span_processor(BatchSpanProcessor(exporter))
+    tracer = tracer_provider.get_tracer("redlib_mcp")
+    logger.info(f"Tracing enabled ({config['exporter']})")
+    return True
+
+
+def shutdown_tracing():
+    """Export pending spans, stop the exporter and close the trace file. init_tracing() can start it again."""
+    global tracer, tracer_provider, trace_file
+    if tracer_provider is not None:
+        tracer_provider.shutdown()
+    if trace_file is not None:
+        trace_file.close()
+    tracer = tracer_provider = trace_file = None
+
+
+def span(name: str, **attributes):
+    """Start a span as the current span, or do nothing when tracing is off."""
+    if tracer is None:
+        return nullcontext()
+    return tracer.start_as_current_span(name, attributes=attributes)
+
+
+def set_span_attribute(key: str, value):
+    """Set an attribute on the current span, if tracing is on."""
+    if tracer is not None:
+        trace.get_current_span().set_attribute(key, value)
+
+
+class TracingMiddleware(Middleware):
+    """Wrap each MCP tool call in a span."""
+
+    async def on_call_tool(self, context, call_next):
+        with span(f"tool {context.message.name}", **{"mcp.tool.name": context.message.name}):
+            return await call_next(context)
+
+
+# Prometheus metrics (no-ops when prometheus_client is not installed)
+if prometheus_client is not None:
+    metrics_registry = prometheus_client.CollectorRegistry()
+    TOOL_CALLS = prometheus_client.Counter(
+        "redlib_tool_calls", "MCP tool calls by outcome", ["tool", "status"], registry=metrics_registry
+    )
+    TOOL_SECONDS = prometheus_client.Histogram(
+        "redlib_tool_duration_seconds", "End-to-end tool call latency", ["tool"],
+        buckets=PHASE_BUCKETS, registry=metrics_registry,
+    )
+    PHASE_SECONDS = prometheus_client.Histogram(
+        "redlib_tool_phase_seconds", "Tool time spent per phase (fetch, strip, serialize)", ["tool", "phase"],
+        buckets=PHASE_BUCKETS, registry=metrics_registry,
+    )
+    RESPONSE_BYTES = prometheus_client.Histogram(
+        "redlib_response_size_bytes", "Response size from Redlib (upstream) and returned to the caller (output)",
+        ["tool", "stage"], buckets=SIZE_BUCKETS, registry=metrics_registry,
+    )
+    UPSTREAM_RESPONSES = prometheus_client.Counter(
+        "redlib_upstream_responses", "Redlib responses by HTTP status (or error)", ["status"], registry=metrics_registry
+    )
+else:
+    metrics_registry = None
+
+# Whether tool calls and upstream responses are recorded
+metrics_enabled = prometheus_client is not None
+
+
+def observe_phase(tool: str, phase: str, seconds: float):
+    if metrics_enabled:
+        PHASE_SECONDS.labels(tool, phase).observe(seconds)
+
+
+def observe_sizes(tool: str, upstream: int | None, output: str):
+    if metrics_enabled:
+        if upstream is not None:
+            RESPONSE_BYTES.labels(tool, "upstream").observe(upstream)
+        RESPONSE_BYTES.labels(tool, "output").observe(len(output.encode()))
+
+
+def record_upstream_status(status: int | str):
+    if metrics_enabled:
+        UPSTREAM_RESPONSES.labels(str(status)).inc()
+
+
+class MetricsMiddleware(Middleware):
+    """Count MCP tool calls by outcome and time them end to end."""
+
+    async def on_call_tool(self, context, call_next):
+        if not metrics_enabled:
+            return await call_next(context)
+        tool = context.message.name
+        status = "error"
+        start = time.perf_counter()
+        try:
+            result = await call_next(context)
+            status = "ok"
+            return result
+        finally:
+            TOOL_CALLS.labels(tool, status).inc()
+            TOOL_SECONDS.labels(tool).observe(time.perf_counter() - start)
+
+
+class StatsCollector:
+    """
+    Expose cache, rate limiter, backend and client counters at scrape time.
+
+    These are read from the live objects, so they describe the process that
+    serves the scrape, even in multi-worker mode.
+    """
+
+    def collect(self):
+        cache_entries = GaugeMetricFamily("redlib_cache_entries", "Entries held per cache", labels=["cache"])
+        cache_bytes = GaugeMetricFamily("redlib_cache_bytes", "Bytes held per cache", labels=["cache"])
+        cache_events = CounterMetricFamily(
+            "redlib_cache_events", "Cache lookups and removals by event", labels=["cache", "event"]
+        )
+        caches = [("output", output_cache)]
+        if client is not None:
+            caches += [("response", client.cache), ("disk", client.disk_cache)]
+        for name, cache in caches:
+            if cache is None:
+                continue
+            stats = cache.stats()
+            cache_entries.add_metric([name], stats["entries"])
+            cache_bytes.add_metric([name], stats["bytes"])
+            for event in ("hits", "misses", "stale_hits", "evictions", "expirations"):
+                if event in stats:
+                    cache_events.add_metric([name, event], stats[event])
+        yield from (cache_entries, cache_bytes, cache_events)
+
+        if client is None:
+            return
+        events = CounterMetricFamily("redlib_client_events", "Request coalescing, retry and hedging", labels=["event"])
+        for event in ("coalesced", "retried", "hedges_sent", "hedges_won", "not_modified", "revalidations"):
+            events.add_metric([event], getattr(client, event))
+        if offloader is not None:
+            events.add_metric(["offloaded"], offloader.offloaded)
+        yield events
+
+        if client.limiter is not None:
+            stats = client.limiter.stats()
+            yield GaugeMetricFamily("redlib_upstream_queue_depth", "Requests waiting for a slot", stats["queue_depth"])
+            yield GaugeMetricFamily("redlib_upstream_in_flight", "Requests holding a slot", stats["in_flight"])
+            yield CounterMetricFamily(
+                "redlib_upstream_throttled", "Queue pauses for Redlib rate limiting (429 Retry-After)", stats["throttled"]
+            )
+            yield CounterMetricFamily(
+                "redlib_upstream_wait_seconds", "Total time spent waiting for a slot", stats["total_wait_seconds"]
+            )
+            yield GaugeMetricFamily(
+                "redlib_upstream_max_wait_seconds", "Longest time a request waited for a slot", stats["max_wait_seconds"]
+            )
+
+        healthy = GaugeMetricFamily("redlib_backend_healthy", "Whether a backend is in rotation", labels=["backend"])
+        outstanding = GaugeMetricFamily("redlib_backend_outstanding", "Requests in flight", labels=["backend"])
+        latency = GaugeMetricFamily("redlib_backend_latency_seconds", "EWMA response latency", labels=["backend"])
+        requests = CounterMetricFamily("redlib_backend_requests", "Requests sent", labels=["backend"])
+        errors = CounterMetricFamily("redlib_backend_errors", "Failed requests", labels=["backend"])
+        for backend in client.backends:
+            stats = backend.stats()
+            healthy.add_metric([backend.url], 1 if stats["healthy"] else 0)
+            outstanding.add_metric([backend.url], stats["outstanding"])
+            if stats["ewma_seconds"] is not None:
+                latency.add_metric([backend.url], stats["ewma_seconds"])
+            requests.add_metric([backend.url], stats["requests"])
+            errors.add_metric([backend.url], stats["errors"])
+        yield from (healthy, outstanding, latency, requests, errors)
+
+
+if prometheus_client is not None:
+    metrics_registry.register(StatsCollector())
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    """
+    Serve metrics in the Prometheus text format.
+
+    With PROMETHEUS_MULTIPROC_DIR set (see prometheus_client's multiprocess
+    mode), counters and histograms are summed across all workers.
+    """
+    registry = metrics_registry
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(StatsCollector())
+    return Response(prometheus_client.generate_latest(registry), media_type=prometheus_client.CONTENT_TYPE_LATEST)
+
+
+def load_profiling_config() -> dict:
+    """
+    Load settings for sampling tool calls with cProfile and/or tracemalloc.
+
+    Profiling is off while REDLIB_PROFILE_RATE is 0. The settings are re-read
+    every few seconds (see Profiler.start_reloading), so putting them in
+    ~/.config/redlib/config.json turns profiling on and off in a running
+    server, including every worker in multi-worker mode. Environment
+    variables take precedence over the file.
+
+    Settings:
+        REDLIB_PROFILE_RATE: Percentage of tool calls to profile, 0-100 (default: 0)
+        REDLIB_PROFILE_MODE: "cpu" (cProfile), "memory" (tracemalloc) or "both" (default: cpu)
+        REDLIB_PROFILE_DIR: Directory for profiles (default: ~/.config/redlib/profiles)
+    """
+    config = read_config_file()
+    mode = config_value("REDLIB_PROFILE_MODE", "cpu", config).lower()
+    if mode not in ("cpu", "memory", "both"):
+        logger.warning(f"Unknown profile mode {mode!r} - using cpu")
+        mode = "cpu"
+    default_dir = str(Path.home() / ".config" / "redlib" / "profiles")
+    return {
+        "rate": min(100.0, max(0.0, float(config_value("REDLIB_PROFILE_RATE", "0", config)))),
+        "mode": mode,
+        "directory": Path(config_value("REDLIB_PROFILE_DIR", default_dir, config)).expanduser(),
+    }
+
+
+class Profiler:
+    """
+    Profile a random sample of tool calls and write the results to a directory.
+
+    Each sampled call produces <stamp>-<tool>-<args hash>.json with the tool
+    name, arguments, duration and outcome (plus the top allocation sites in
+    memory mode) and, in cpu mode, a matching .prof file for pstats or
+    snakeviz.
+
+    cProfile records the whole thread while the call is awaited, so other
+    tool calls running concurrently on the event loop show up in the
+    profile too, while work offloaded to a pool does not. Only one call is
+    profiled at a time; calls sampled meanwhile run unprofiled.
+
+    start_reloading() re-reads the settings in the background, so they can
+    change while the server runs.
+    """
+
+    def __init__(self, rate: float = 0.0, mode: str = "cpu", directory: Path | None = None):
+        self.rate = rate
+        self.mode = mode
+        self.directory = directory or Path.home() / ".config" / "redlib" / "profiles"
+        self.profiled = 0
+        self._active = False
+        self._reload_task: asyncio.Task | None = None
+
+    def start_reloading(self):
+        """Start re-reading the settings every PROFILE_RELOAD_SECONDS in a background task."""
+        if self._reload_task is None:
+            self._reload_task = asyncio.create_task(self._reload_loop())
+
+    def stop_reloading(self):
+        """Cancel the background reload task, if running."""
+        if self._reload_task is not None:
+            self._reload_task.cancel()
+            self._reload_task = None
+
+    async def _reload_loop(self):
+        while True:
+            await asyncio.sleep(PROFILE_RELOAD_SECONDS)
+            try:
+                # Reading the config file is blocking I/O; keep it off the event loop
+                config = await asyncio.to_thread(load_profiling_config)
+            except ValueError as e:
+                logger.warning(f"Invalid profiling settings: {e}")
+                continue
+            self.apply(config)
+
+    def apply(self, config: dict):
+        """Switch to settings from load_profiling_config."""
+        if (config["rate"], config["mode"]) != (self.rate, self.mode):
+            logger.info(f"Profiling {config['rate']:g}% of tool calls ({config['mode']})")
+        self.rate, self.mode, self.directory = config["rate"], config["mode"], config["directory"]
+
+    def should_profile(self) -> bool:
+        return self.rate > 0 and not self._active and random.random() * 100 < self.rate
+
+    async def profile(self, tool: str, arguments: dict | None, call: Callable[[], Awaitable]):
+        """Await call() under the configured profilers and write the results."""
+        self._active = True
+        cpu = cProfile.Profile() if self.mode in ("cpu", "both") else None
+        memory = self.mode in ("memory", "both")
+        started_tracing = memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if memory:
+            tracemalloc.reset_peak()
+            before = tracemalloc.take_snapshot()
+        status = "error"
+        started = time.time()
+        start = time.perf_counter()
+        try:
+            if cpu is not None:
+                cpu.enable()
+            try:
+                result = await call()
+            finally:
+                if cpu is not None:
+                    cpu.disable()
+            status = "ok"
+            return result
+        finally:
+            record = {
+                "tool": tool,
+                "arguments": arguments or {},
+                "started": started,
+                "duration_seconds": time.perf_counter() - start,
+                "status": status,
+                "pid": os.getpid(),
+                "mode": self.mode,
+            }
+            if memory:
+                record["peak_traced_bytes"] = tracemalloc.get_traced_memory()[1]
+                top = tracemalloc.take_snapshot().compare_to(before, "lineno")[:PROFILE_TOP_ALLOCATIONS]
+                record["top_allocations"] = [str(stat) for stat in top]
+                if started_tracing:
+                    tracemalloc.stop()
+            self._active = False
+            self.profiled += 1
+            try:
+                await asyncio.to_thread(self._write, record, cpu)
+            except OSError as e:
+                logger.warning(f"Could not write profile for {tool}: {e}")
+
+    def _write(self, record: dict, cpu: cProfile.Profile | None):
+        tag = hashlib.sha1(json.dumps(record["arguments"], sort_keys=True, default=str).encode()).hexdigest()[:8]
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(record["started"]))
+        base = self.directory / f"{stamp}-{record['tool']}-{tag}-{record['pid']}"
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if cpu is not None:
+            cpu.dump_stats(f"{base}.prof")
+            record["profile"] = f"{base.name}.prof"
+        Path(f"{base}.json").write_text(json.dumps(record, indent=2, default=str))
+
+
+class ProfilingMiddleware(Middleware):
+    """Profile a sample of MCP tool calls (see Profiler)."""
+
+    async def on_call_tool(self, context, call_next):
+        if profiler is None or not profiler.should_profile():
+            return await call_next(context)
+        message = context.message
+        return await profiler.profile(message.name, message.arguments, lambda: call_next(context))
 
-# Initialize MCP server
-server = FastMCP("redlib-mcp")
 
 # Global client instance
 client: RedlibClient | None = None
 
+# Cache of final serialized tool output, keyed by tool name + normalized request
+output_cache: ResponseCache | None = None
+
+# Pool for stripping and serializing large responses off the event loop
+offloader: Offloader | None = None
+
+# Samples tool calls for profiling (rate 0 = off until the settings change)
+profiler: Profiler | None = None
+
 
 def init_client():
-    """Initialize the Redlib client from configuration."""
-    global client
-    base_url = load_config()
-    client = RedlibClient(base_url)
-    logger.info(f"Initialized Redlib client for {base_url}")
+    """Initialize the Redlib client and its connection pool from configuration."""
+    global client, output_cache, offloader, profiler
+    set_json_backend(config_value("REDLIB_JSON_BACKEND", "auto"))
+    init_tracing(load_tracing_config())
+    base_urls = load_backend_urls()
+    client_config = load_client_config()
+    cache_config = load_cache_config()
+    cache = ResponseCache(**cache_config) if cache_config else None
+    rate_limit_config = load_rate_limit_config()
+    limiter = RateLimiter(**rate_limit_config) if rate_limit_config else None
+    disk_cache_config = load_disk_cache_config()
+    disk_cache = DiskCache(**disk_cache_config) if disk_cache_config else None
+    client = RedlibClient(
+        base_urls,
+        cache=cache,
+        limiter=limiter,
+        disk_cache=disk_cache,
+        on_refresh=invalidate_output,
+        **client_config,
+    )
+    client.open()
+    output_cache_config = load_cache_config("REDLIB_OUTPUT_CACHE")
+    output_cache = ResponseCache(**output_cache_config) if output_cache_config else None
+    offload_config = load_offload_config()
+    if offloader is not None:
+        offloader.shutdown()
+    offloader = Offloader(**offload_config) if offload_config else None
+    if profiler is not None:
+        profiler.stop_reloading()
+    profiler = Profiler(**load_profiling_config())
+    logger.info(
+        f"Initialized Redlib client for {', '.join(base_urls)} "
+        f"(max_connections={client_config['max_connections']}, http2={client.http2}, "
+        f"cache={'on' if cache else 'off'}, disk_cache={'on' if disk_cache else 'off'}, "
+        f"output_cache={'on' if output_cache else 'off'}, "
+        f"offload={offloader.pool if offloader else 'off'}, "
+        f"profile={f'{profiler.rate:g}% {profiler.mode}' if profiler.rate else 'off'}, "
+        f"json={json_backend})"
+    )
+
+
+def output_cache_key(tool: str, path: str, params: dict | None, options: dict | None = None) -> str:
+    """Build the output cache key for a tool call from its normalized request and options."""
+    cache_key = f"{tool}:{ResponseCache.key(path, params)}"
+    options = {k: v for k, v in (options or {}).items() if v is not None}
+    if options:
+        cache_key += "#" + urlencode(sorted(options.items()))
+    return cache_key
+
+
+def invalidate_output(request_key: str):
+    """Drop cached tool outputs rendered from a request (a ResponseCache.key)."""
+    if output_cache is not None:
+        output_cache.discard(lambda key: key.split(":", 1)[1].split("#", 1)[0] == request_key)
+
+
+def cache_output(cache_key: str, output: str, path: str, fresh_until: float | None):
+    """
+    Store a tool output for its path's TTL, but no longer than its source stays fresh.
 
+    fresh_until is when the response(s) the output was rendered from expire
+    (see RedlibClient.expires_at), or None if unknown. Output of a response
+    served stale gets a TTL <= 0 and is not stored.
+    """
+    ttl = output_cache.ttl_for(path)
+    if fresh_until is not None:
+        ttl = min(ttl, fresh_until - time.monotonic())
+    output_cache.set(cache_key, output, len(output), ttl)
 
-@server.tool()
-async def get_subreddit(
-    subreddit: str,
-    sort: str = "hot",
-    time: str | None = None,
-    after: str | None = None,
+
+def parse_format(output_format: str) -> str:
+    """Validate a listing output format (one of OUTPUT_FORMATS)."""
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown format: {output_format} (choose from {', '.join(OUTPUT_FORMATS)})")
+    return output_format
+
+
+def post_table(posts: list) -> tuple[list[str], list[list]]:
+    """Columns (in POST_FIELD_ORDER, only those present) and one row per post."""
+    present = set()
+    for post in posts:
+        present.update(post)
+    columns = [k for k in POST_FIELD_ORDER if k in present]
+    return columns, [[post.get(k) for k in columns] for post in posts]
+
+
+def csv_cell(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json_dumps(value)
+    return str(value)
+
+
+def render_output(data: dict, output_format: str = "json", max_chars: int | None = None) -> str:
+    """
+    Serialize a stripped response in output_format, pruned to max_chars.
+
+    "table" replaces the posts array with {"columns": [...], "rows": [[...]]}.
+    "csv" and "tsv" return the posts as delimited text with a header row,
+    followed by a "# after: <cursor>" line when there is a next page.
+    Responses without posts are always JSON. Budgets are applied to the
+    JSON shape first; the tabular forms are smaller.
+    """
+    if output_format == "json":
+        return fit_to_budget(data, max_chars) if max_chars is not None else json_dumps(data)
+    if max_chars is not None:
+        fit_to_budget(data, max_chars)
+
+    listing = listing_of(data)
+    posts = listing.get("posts")
+    if not isinstance(posts, list):
+        return json_dumps(data)
+    columns, rows = post_table(posts)
+    if output_format == "table":
+        listing["posts"] = {"columns": columns, "rows": rows}
+        return json_dumps(data)
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter="," if output_format == "csv" else "\t", lineterminator="\n")
+    writer.writerow(columns)
+    writer.writerows([csv_cell(value) for value in row] for row in rows)
+    if listing.get("after"):
+        buffer.write(f"# after: {listing['after']}\n")
+    return buffer.getvalue()
+
+
+def strip_and_serialize(
+    data: dict,
+    options: dict,
+    max_chars: int | None = None,
+    output_format: str = "json",
+) -> str:
+    """Strip a response and serialize it (module-level so process pools can pickle it)."""
+    return timed_strip_and_serialize(data, options, max_chars, output_format)[0]
+
+
+def timed_strip_and_serialize(
+    data: dict,
+    options: dict,
+    max_chars: int | None = None,
+    output_format: str = "json",
+) -> tuple[str, float, float]:
+    """strip_and_serialize, also returning the seconds spent stripping and serializing."""
+    start = time.perf_counter()
+    # Typed decoding already stripped the body. Pruning and tabular formats
+    # edit the stripped copy in place, so those still need a fresh one.
+    if (
+        isinstance(data, StrippedResponse)
+        and not any(options.values())
+        and max_chars is None
+        and output_format == "json"
+    ):
+        stripped = data
+    else:
+        with span("strip_response"):
+            stripped = strip_response(data, **options)
+    stripped_at = time.perf_counter()
+    with span("serialize", **{"redlib.format": output_format}):
+        output = render_output(stripped, output_format, max_chars)
+    return output, stripped_at - start, time.perf_counter() - stripped_at
+
+
+async def fetch_tool_output(
+    tool: str,
+    path: str,
+    params: dict | None = None,
+    strip_options: dict | None = None,
+    max_chars: int | None = None,
+    output_format: str = "json",
 ) -> str:
     """
-    Fetch posts from a subreddit.
+    Fetch a Redlib endpoint and return the stripped, serialized tool output.
+
+    strip_options are passed to strip_response, and the result is rendered
+    in output_format and pruned to max_chars (see render_output). The final
+    string is cached per tool, normalized request and options, so repeat
+    calls skip both strip_response and serialization, until the response it
+    was rendered from expires (see cache_output). Responses at or above the
+    offload threshold are stripped and serialized in the offload pool.
+    """
+    options = {k: v for k, v in (strip_options or {}).items() if v is not None}
+    output_options = {**options, "max_chars": max_chars, "format": output_format if output_format != "json" else None}
+    cache_key = output_cache_key(tool, path, params, output_options)
+    if output_cache is not None:
+        cached = output_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    start = time.perf_counter()
+    result = await client.get(path, params=params)
+    observe_phase(tool, "fetch", time.perf_counter() - start)
+    fresh_until = client.expires_at(path, params, result) if output_cache is not None else None
 
-    Args:
-        subreddit: Subreddit name, r/name, or Reddit URL
-        sort: Sort order - hot, new, top, rising
-        time: Time filter for top sort - hour, day, week, month, year, all
-        after: Pagination cursor from previous response
+    size = client.response_size(path, params)
+    if offloader is not None and offloader.should_offload(size):
+        output, strip_seconds, serialize_seconds = await offloader.run(
+            timed_strip_and_serialize, result, options, max_chars, output_format
+        )
+    else:
+        output, strip_seconds, serialize_seconds = timed_strip_and_serialize(result, options, max_chars, output_format)
+    observe_phase(tool, "strip", strip_seconds)
+    observe_phase(tool, "serialize", serialize_seconds)
+    observe_sizes(tool, size, output)
+
+    if output_cache is not None:
+        cache_output(cache_key, output, path, fresh_until)
+    return output
+
+
+def listing_of(page: dict) -> dict:
+    """Return the dict holding posts and the after cursor (the data wrapper if present)."""
+    data = page.get("data")
+    return data if isinstance(data, dict) else page
+
+
+async def fetch_listing_output(
+    tool: str,
+    path: str,
+    params: dict | None = None,
+    max_pages: int | None = None,
+    max_items: int | None = None,
+    ctx: Context | None = None,
+    max_chars: int | None = None,
+    fields: tuple[str, ...] | None = None,
+    output_format: str = "json",
+) -> str:
+    """
+    Fetch a listing, following the after cursor server-side.
+
+    Stops after max_pages pages (capped at PAGINATE_MAX_PAGES), once
+    max_items posts are collected, or when Redlib returns no cursor. Posts
+    from every page are merged into the first page's shape, with "after"
+    pointing past the last returned post. Progress is reported to the
+    client after each page. Without either limit this is a single fetch.
+    Posts are projected to fields (see parse_fields) and the merged listing
+    is rendered in output_format and pruned to max_chars (see render_output).
+    The output is cached until the first of its pages expires.
+    """
+    for name, limit in (("max_pages", max_pages), ("max_items", max_items)):
+        if limit is not None and limit < 1:
+            raise ValueError(f"{name} must be at least 1, got {limit}")
+    if not max_pages and not max_items:
+        return await fetch_tool_output(
+            tool,
+            path,
+            params=params,
+            strip_options={"fields": fields},
+            max_chars=max_chars,
+            output_format=output_format,
+        )
 
-    Returns:
-        JSON with subreddit info, posts array, and pagination cursor
+    page_limit = min(max_pages or PAGINATE_MAX_PAGES, PAGINATE_MAX_PAGES)
+    options = {
+        "max_pages": page_limit,
+        "max_items": max_items,
+        "max_chars": max_chars,
+        "fields": fields,
+        "format": output_format if output_format != "json" else None,
+    }
+    cache_key = output_cache_key(tool, path, params, options)
+    if output_cache is not None:
+        cached = output_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    params = dict(params or {})
+    merged: dict | None = None
+    posts: list = []
+    after = None
+    upstream_size = 0
+    fresh_until: float | None = None
+    for page_number in range(1, page_limit + 1):
+        start = time.perf_counter()
+        raw = await client.get(path, params=params or None)
+        fetched_at = time.perf_counter()
+        if output_cache is not None:
+            page_until = client.expires_at(path, params or None, raw)
+            if page_until is not None:
+                fresh_until = page_until if fresh_until is None else min(fresh_until, page_until)
+        with span("strip_response"):
+            page = strip_response(raw, fields=fields)
+        observe_phase(tool, "fetch", fetched_at - start)
+        observe_phase(tool, "strip", time.perf_counter() - fetched_at)
+        if metrics_enabled:
+            upstream_size += client.response_size(path, params or None) or 0
+        listing = listing_of(page)
+        page_posts = listing.get("posts") or []
+        if merged is None:
+            merged = page
+        posts.extend(page_posts)
+        after = listing.get("after")
+
+        if max_items is not None and len(posts) >= max_items:
+            if len(posts) > max_items:
+                posts = posts[:max_items]
+                # Resume after the last post returned, not the end of the page
+                last_id = posts[-1].get("id") if posts else None
+                after = f"t3_{last_id}" if last_id else after
+            done = True
+        else:
+            done = not after or not page_posts
+
+        if ctx is not None:
+            await ctx.report_progress(
+                page_number,
+                None if done else page_limit,
+                message=f"Fetched page {page_number}: {len(posts)} items",
+            )
+        if done:
+            break
+        params["after"] = after
+
+    listing = listing_of(merged)
+    if "posts" in listing or posts:
+        listing["posts"] = posts
+    if "after" in listing or after:
+        listing["after"] = after
+    start = time.perf_counter()
+    with span("serialize", **{"redlib.format": output_format}):
+        output = render_output(merged, output_format, max_chars)
+    observe_phase(tool, "serialize", time.perf_counter() - start)
+    observe_sizes(tool, upstream_size, output)
+
+    if output_cache is not None:
+        cache_output(cache_key, output, path, fresh_until)
+    return output
+
+
+def batch_item_chars(max_chars: int | None, inputs: list[str]) -> int | None:
+    """Split a batch character budget evenly, less each entry's input and wrapper."""
+    if max_chars is None or not inputs:
+        return max_chars
+    overhead = len('{"results":[]}') + sum(len(json_dumps(item)) + len('{"input":,"result":},') for item in inputs)
+    return max(1, (max_chars - overhead) // len(inputs))
+
+
+async def run_batch(inputs: list[str], fetch: Callable[[str], Awaitable[str]]) -> str:
     """
+    Run fetch for each input concurrently and combine the serialized outputs.
+
+    At most BATCH_CONCURRENCY fetches run at once. Results keep input order;
+    a failing item gets an "error" entry instead of failing the batch.
+    Returns {"results": [{"input": ..., "result": ...} | {"input": ..., "error": ...}]}
+    """
+    if len(inputs) > BATCH_MAX_ITEMS:
+        raise ValueError(f"Batch too large: {len(inputs)} items (max {BATCH_MAX_ITEMS})")
+
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def run_one(item: str) -> str:
+        async with semaphore:
+            try:
+                output = await fetch(item)
+            except Exception as e:
+                logger.info(f"Batch item {item!r} failed: {e}")
+                return f'{{"input":{json_dumps(item)},"error":{json_dumps(str(e) or type(e).__name__)}}}'
+        # Splice the cached tool output in as-is rather than re-serializing it
+        return f'{{"input":{json_dumps(item)},"result":{output}}}'
+
+    parts = await asyncio.gather(*(run_one(item) for item in inputs))
+    return '{"results":[' + ",".join(parts) + "]}"
+
+
+@asynccontextmanager
+async def client_lifespan(mcp_server: FastMCP):
+    """Open the Redlib connection pool on startup and close it on shutdown."""
     if client is None:
         init_client()
+    else:
+        # A previous lifespan shut tracing down
+        init_tracing(load_tracing_config())
+    client.start_health_checks()
+    if profiler is not None:
+        profiler.start_reloading()
+    try:
+        yield {}
+    finally:
+        if profiler is not None:
+            profiler.stop_reloading()
+        if client is not None:
+            await client.aclose()
+            logger.info("Closed Redlib client connection pool")
+        if offloader is not None:
+            offloader.shutdown()
+        shutdown_tracing()
+
 
+# Initialize MCP server
+server = FastMCP(
+    "redlib-mcp",
+    lifespan=client_lifespan,
+    middleware=[MetricsMiddleware(), TracingMiddleware(), ProfilingMiddleware()],
+)
+
+
+def subreddit_request(
+    subreddit: str,
+    sort: str = "hot",
+    time: str | None = None,
+    after: str | None = None,
+) -> tuple[str, dict | None]:
+    """Build the Redlib path and query params for a subreddit listing."""
     path = normalize_subreddit(subreddit)
 
     # Append sort to path
@@ -341,14 +2901,79 @@ async def get_subreddit(
     if after:
         params["after"] = after
 
-    result = await client.get(path, params=params if params else None)
-    return json.dumps(strip_response(result))
+    return path, params if params else None
+
+
+def post_path(post: str, comment_id: str | None = None) -> str:
+    """Build the Redlib path for a post, optionally focused on one comment thread."""
+    path = normalize_post(post)
+
+    # Append comment ID if focusing on specific thread
+    if comment_id:
+        # Ensure comment_id doesn't have leading slash
+        comment_id = comment_id.lstrip("/")
+        path = f"{path}/{comment_id}"
+
+    return path
+
+
+@server.tool()
+async def get_subreddit(
+    subreddit: str,
+    sort: str = "hot",
+    time: str | None = None,
+    after: str | None = None,
+    max_pages: int | None = None,
+    max_items: int | None = None,
+    max_chars: int | None = None,
+    max_tokens: int | None = None,
+    fields: list[str] | None = None,
+    format: str = "json",
+    ctx: Context | None = None,
+) -> str:
+    """
+    Fetch posts from a subreddit.
+
+    Args:
+        subreddit: Subreddit name, r/name, or Reddit URL
+        sort: Sort order - hot, new, top, rising
+        time: Time filter for top sort - hour, day, week, month, year, all
+        after: Pagination cursor from previous response
+        max_pages: Follow the pagination cursor for up to this many pages (max 20)
+        max_items: Follow the pagination cursor until this many posts are collected
+        max_chars: Prune the result to fit this many characters
+        max_tokens: Prune the result to fit roughly this many tokens
+        fields: Post fields to return, e.g. ["title", "score"] (default: all; id is always included)
+        format: Output format - json, table (columns + rows), csv, tsv (posts only, cursor on the last line)
+
+    Returns:
+        JSON with subreddit info, posts array, and pagination cursor
+    """
+    if client is None:
+        init_client()
+
+    path, params = subreddit_request(subreddit, sort, time, after)
+    return await fetch_listing_output(
+        "get_subreddit",
+        path,
+        params,
+        max_pages,
+        max_items,
+        ctx,
+        budget_chars(max_chars, max_tokens),
+        parse_fields(fields),
+        parse_format(format),
+    )
 
 
 @server.tool()
 async def get_post(
     post: str,
     comment_id: str | None = None,
+    max_depth: int | None = None,
+    max_comments: int | None = None,
+    max_chars: int | None = None,
+    max_tokens: int | None = None,
 ) -> str:
     """
     Fetch a post with its comments.
@@ -356,6 +2981,14 @@ async def get_post(
     Args:
         post: Post ID, permalink path, or Reddit URL
         comment_id: Optional comment ID to focus on a specific thread
+        max_depth: Maximum reply nesting to return (1 = top-level comments only)
+        max_comments: Maximum number of comments to return
+        max_chars: Prune the result to fit this many characters
+        max_tokens: Prune the result to fit roughly this many tokens
+
+    Omitted comments are replaced by {"kind": "more", "count": N} markers.
+    Over budget, the deepest and lowest-score comments go first, then long
+    bodies are truncated with "…".
 
     Returns:
         JSON with post data and comments array
@@ -363,16 +2996,12 @@ async def get_post(
     if client is None:
         init_client()
 
-    path = normalize_post(post)
-
-    # Append comment ID if focusing on specific thread
-    if comment_id:
-        # Ensure comment_id doesn't have leading slash
-        comment_id = comment_id.lstrip("/")
-        path = f"{path}/{comment_id}"
-
-    result = await client.get(path)
-    return json.dumps(strip_response(result))
+    return await fetch_tool_output(
+        "get_post",
+        post_path(post, comment_id),
+        strip_options={"max_depth": max_depth, "max_comments": max_comments},
+        max_chars=budget_chars(max_chars, max_tokens),
+    )
 
 
 @server.tool()
@@ -380,6 +3009,13 @@ async def get_user(
     username: str,
     listing: str = "overview",
     after: str | None = None,
+    max_pages: int | None = None,
+    max_items: int | None = None,
+    max_chars: int | None = None,
+    max_tokens: int | None = None,
+    fields: list[str] | None = None,
+    format: str = "json",
+    ctx: Context | None = None,
 ) -> str:
     """
     Fetch a user's profile and content.
@@ -388,6 +3024,12 @@ async def get_user(
         username: Username, u/name, or Reddit user URL
         listing: Content type - overview, submitted, comments
         after: Pagination cursor from previous response
+        max_pages: Follow the pagination cursor for up to this many pages (max 20)
+        max_items: Follow the pagination cursor until this many items are collected
+        max_chars: Prune the result to fit this many characters
+        max_tokens: Prune the result to fit roughly this many tokens
+        fields: Post fields to return, e.g. ["title", "score"] (default: all; id is always included)
+        format: Output format - json, table (columns + rows), csv, tsv (posts only, cursor on the last line)
 
     Returns:
         JSON with user info, posts array, and pagination cursor
@@ -406,8 +3048,17 @@ async def get_user(
     if after:
         params["after"] = after
 
-    result = await client.get(path, params=params if params else None)
-    return json.dumps(strip_response(result))
+    return await fetch_listing_output(
+        "get_user",
+        path,
+        params if params else None,
+        max_pages,
+        max_items,
+        ctx,
+        budget_chars(max_chars, max_tokens),
+        parse_fields(fields),
+        parse_format(format),
+    )
 
 
 @server.tool()
@@ -415,6 +3066,13 @@ async def search_reddit(
     query: str,
     subreddit: str | None = None,
     after: str | None = None,
+    max_pages: int | None = None,
+    max_items: int | None = None,
+    max_chars: int | None = None,
+    max_tokens: int | None = None,
+    fields: list[str] | None = None,
+    format: str = "json",
+    ctx: Context | None = None,
 ) -> str:
     """
     Search for posts on Reddit.
@@ -423,6 +3081,12 @@ async def search_reddit(
         query: Search query string
         subreddit: Optional subreddit to limit search to
         after: Pagination cursor from previous response
+        max_pages: Follow the pagination cursor for up to this many pages (max 20)
+        max_items: Follow the pagination cursor until this many results are collected
+        max_chars: Prune the result to fit this many characters
+        max_tokens: Prune the result to fit roughly this many tokens
+        fields: Post fields to return, e.g. ["title", "score"] (default: all; id is always included)
+        format: Output format - json, table (columns + rows), csv, tsv (posts only, cursor on the last line)
 
     Returns:
         JSON with search results and pagination cursor
@@ -442,14 +3106,25 @@ async def search_reddit(
     if after:
         params["after"] = after
 
-    result = await client.get(path, params=params)
-    return json.dumps(strip_response(result))
+    return await fetch_listing_output(
+        "search_reddit",
+        path,
+        params,
+        max_pages,
+        max_items,
+        ctx,
+        budget_chars(max_chars, max_tokens),
+        parse_fields(fields),
+        parse_format(format),
+    )
 
 
 @server.tool()
 async def get_wiki(
     subreddit: str,
     page: str = "index",
+    max_chars: int | None = None,
+    max_tokens: int | None = None,
 ) -> str:
     """
     Fetch a subreddit's wiki page.
@@ -457,6 +3132,8 @@ async def get_wiki(
     Args:
         subreddit: Subreddit name, r/name, or Reddit URL
         page: Wiki page name (default: index)
+        max_chars: Prune the result to fit this many characters
+        max_tokens: Prune the result to fit roughly this many tokens
 
     Returns:
         JSON with subreddit, page name, and content
@@ -467,19 +3144,22 @@ async def get_wiki(
     sub_path = normalize_subreddit(subreddit)
     path = f"{sub_path}/wiki/{page}"
 
-    result = await client.get(path)
-    return json.dumps(strip_response(result))
+    return await fetch_tool_output("get_wiki", path, max_chars=budget_chars(max_chars, max_tokens))
 
 
 @server.tool()
 async def get_duplicates(
     post: str,
+    max_chars: int | None = None,
+    max_tokens: int | None = None,
 ) -> str:
     """
     Find cross-posts/duplicates of a post.
 
     Args:
         post: Post ID, permalink, or Reddit URL
+        max_chars: Prune the result to fit this many characters
+        max_tokens: Prune the result to fit roughly this many tokens
 
     Returns:
         JSON with original post and duplicates array
@@ -494,8 +3174,84 @@ async def get_duplicates(
     # /comments/abc123 -> /duplicates/abc123
     path = path.replace("/comments/", "/duplicates/")
 
-    result = await client.get(path)
-    return json.dumps(strip_response(result))
+    return await fetch_tool_output("get_duplicates", path, max_chars=budget_chars(max_chars, max_tokens))
+
+
+@server.tool()
+async def get_posts_batch(
+    posts: list[str],
+    max_depth: int | None = None,
+    max_comments: int | None = None,
+    max_chars: int | None = None,
+    max_tokens: int | None = None,
+) -> str:
+    """
+    Fetch several posts with their comments in one call.
+
+    Args:
+        posts: Post IDs, permalink paths, or Reddit URLs (up to 50)
+        max_depth: Maximum reply nesting to return for each post
+        max_comments: Maximum number of comments to return for each post
+        max_chars: Prune the results to fit this many characters in total
+        max_tokens: Prune the results to fit roughly this many tokens in total
+
+    Returns:
+        JSON with a results array in input order; each entry has the input and
+        either the get_post result or an error message
+    """
+    if client is None:
+        init_client()
+
+    item_chars = batch_item_chars(budget_chars(max_chars, max_tokens), posts)
+
+    async def fetch(post: str) -> str:
+        return await fetch_tool_output(
+            "get_post",
+            post_path(post),
+            strip_options={"max_depth": max_depth, "max_comments": max_comments},
+            max_chars=item_chars,
+        )
+
+    return await run_batch(posts, fetch)
+
+
+@server.tool()
+async def get_subreddits_batch(
+    subreddits: list[str],
+    sort: str = "hot",
+    time: str | None = None,
+    max_chars: int | None = None,
+    max_tokens: int | None = None,
+    fields: list[str] | None = None,
+) -> str:
+    """
+    Fetch the first page of several subreddits in one call.
+
+    Args:
+        subreddits: Subreddit names, r/names, or Reddit URLs (up to 50)
+        sort: Sort order - hot, new, top, rising
+        time: Time filter for top sort - hour, day, week, month, year, all
+        max_chars: Prune the results to fit this many characters in total
+        max_tokens: Prune the results to fit roughly this many tokens in total
+        fields: Post fields to return, e.g. ["title", "score"] (default: all; id is always included)
+
+    Returns:
+        JSON with a results array in input order; each entry has the input and
+        either the get_subreddit result or an error message
+    """
+    if client is None:
+        init_client()
+
+    item_chars = batch_item_chars(budget_chars(max_chars, max_tokens), subreddits)
+    post_fields = parse_fields(fields)
+
+    async def fetch(subreddit: str) -> str:
+        path, params = subreddit_request(subreddit, sort, time)
+        return await fetch_tool_output(
+            "get_subreddit", path, params=params, strip_options={"fields": post_fields}, max_chars=item_chars
+        )
+
+    return await run_batch(subreddits, fetch)
 
 
 def create_authenticated_server() -> FastMCP:
@@ -504,6 +3260,11 @@ def create_authenticated_server() -> FastMCP:
 
     If Access is configured, returns server with OIDCProxy auth.
     Otherwise, returns unauthenticated server with existing tools.
+
+    When prometheus_client is installed and MCP_METRICS_PATH is set (e.g.
+    /metrics; default: empty, disabled), metrics are served at that path.
+    The endpoint is not behind OAuth and lists backend URLs, so restrict it
+    at the proxy when enabling it.
     """
     access_config = load_access_config()
 
@@ -524,23 +3285,70 @@ def create_authenticated_server() -> FastMCP:
         logger.info("OAuth enabled via Cloudflare Access")
         if access_config.get("jwt_signing_key"):
             logger.info("Persistent JWT signing enabled")
-        return FastMCP("redlib-mcp", auth=auth, tools=tools_list)
     else:
+        auth = None
         logger.info("OAuth disabled - no Access credentials configured")
-        return FastMCP("redlib-mcp", tools=tools_list)
+
+    auth_server = FastMCP(
+        "redlib-mcp",
+        auth=auth,
+        tools=tools_list,
+        lifespan=client_lifespan,
+        middleware=[MetricsMiddleware(), TracingMiddleware(), ProfilingMiddleware()],
+    )
+    metrics_path = os.getenv("MCP_METRICS_PATH", "")
+    if metrics_path and prometheus_client is not None:
+        auth_server.custom_route(metrics_path, methods=["GET"])(metrics_endpoint)
+    return auth_server
+
+
+def create_app():
+    """
+    ASGI app factory used by each worker in multi-worker mode.
+
+    Every worker builds its own server from the same environment and config
+    file, so OIDCProxy settings match. Set MCP_JWT_SECRET so every worker
+    signs and verifies tokens with the same explicit key. OAuth client state lives in
+    FastMCP's shared disk store. MCP sessions are process-local, so the app
+    runs stateless and any worker can serve any request. The RedlibClient
+    is created per worker by client_lifespan, so its rate limits apply per
+    worker; main_server divides them between workers before starting them.
+    """
+    return create_authenticated_server().http_app(stateless_http=True)
+
+
+def server_workers() -> int:
+    """Worker count from MCP_SERVER_WORKERS (default: 1, 0 = one per CPU)."""
+    workers = int(os.getenv("MCP_SERVER_WORKERS", "1"))
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return workers
 
 
 def main_server():
     """HTTP server entry point with OAuth support."""
+    host = os.getenv("MCP_SERVER_HOST", "0.0.0.0")
+    port = int(os.getenv("MCP_SERVER_PORT", "8000"))
+    workers = server_workers()
+
+    if workers > 1:
+        # uvicorn needs an import string to start the app in each worker process
+        import uvicorn
+
+        access_config = load_access_config()
+        if access_config and not access_config.get("jwt_signing_key"):
+            logger.warning("MCP_JWT_SECRET not set - workers fall back to a key derived from the client secret")
+        split_rate_limits(workers)
+        logger.info(f"Starting {workers} HTTP workers on {host}:{port}")
+        uvicorn.run("redlib_mcp:create_app", factory=True, host=host, port=port, workers=workers)
+        return
+
     init_client()
 
     # Create server with auth
     auth_server = create_authenticated_server()
 
     # Run HTTP server
-    host = os.getenv("MCP_SERVER_HOST", "0.0.0.0")
-    port = int(os.getenv("MCP_SERVER_PORT", "8000"))
-
     auth_server.run(transport="http", host=host, port=port)
 
 
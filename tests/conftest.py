@@ -0,0 +1,12 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def reset_server_state(monkeypatch):
+    """Start every test without an output cache, offload pool, profiler or metrics left over from server startup."""
+    import redlib_mcp
+
+    monkeypatch.setattr(redlib_mcp, "output_cache", None)
+    monkeypatch.setattr(redlib_mcp, "offloader", None)
+    monkeypatch.setattr(redlib_mcp, "profiler", None)
+    monkeypatch.setattr(redlib_mcp, "metrics_enabled", False)
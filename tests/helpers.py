@@ -0,0 +1,7 @@
+import httpx
+
+
+def make_response(status_code: int, json_data: dict) -> httpx.Response:
+    """Create a properly configured httpx.Response for testing."""
+    request = httpx.Request("GET", "http://test.com")
+    return httpx.Response(status_code, json=json_data, request=request)
@@ -0,0 +1,102 @@
+import json
+import pytest
+import httpx
+from pathlib import Path
+from unittest.mock import patch
+
+
+def pool_client(handler, urls=("http://a.test", "http://b.test"), **kwargs):
+    from redlib_mcp import RedlibClient
+
+    client = RedlibClient(list(urls), retry_backoff=0.001, **kwargs)
+    client._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_load_backend_urls(tmp_path, monkeypatch):
+    from redlib_mcp import load_backend_urls
+
+    monkeypatch.setenv("REDLIB_URLS", "http://a.test, http://b.test")
+    assert load_backend_urls() == ["http://a.test", "http://b.test"]
+
+    monkeypatch.delenv("REDLIB_URLS")
+    monkeypatch.setenv("REDLIB_URL", "http://single.test")
+    config_dir = tmp_path / ".config" / "redlib"
+    config_dir.mkdir(parents=True)
+    (config_dir / "config.json").write_text(json.dumps({"REDLIB_URLS": ["http://c.test", "http://d.test"]}))
+    with patch.object(Path, "home", return_value=tmp_path):
+        assert load_backend_urls() == ["http://c.test", "http://d.test"]
+
+    (config_dir / "config.json").write_text("{}")
+    with patch.object(Path, "home", return_value=tmp_path):
+        assert load_backend_urls() == ["http://single.test"]
+
+
+def test_pick_backend_prefers_fewer_outstanding_and_lower_latency():
+    from redlib_mcp import RedlibClient
+
+    client = RedlibClient(["http://a.test", "http://b.test"])
+    a, b = client.backends
+    a.ewma = b.ewma = 0.1
+    a.outstanding = 2
+    assert client.pick_backend() is b
+
+    a.outstanding = b.outstanding = 0
+    a.ewma = 0.5
+    assert client.pick_backend() is b
+
+
+@pytest.mark.asyncio
+async def test_failing_backend_is_ejected_and_requests_fail_over():
+    from redlib_mcp import BACKEND_EJECT_FAILURES
+
+    def handler(request):
+        if request.url.host == "a.test":
+            raise httpx.ConnectError("down", request=request)
+        return httpx.Response(200, json={"host": "b"})
+
+    client = pool_client(handler, retries=BACKEND_EJECT_FAILURES)
+    a, b = client.backends
+    b.ewma = 1.0  # make the healthy backend look slow so "a" is tried first
+
+    assert await client.get("/r/rust/hot") == {"host": "b"}
+
+    assert not a.healthy
+    assert a.errors == BACKEND_EJECT_FAILURES
+    assert client.pick_backend() is b
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_health_check_ejects_and_readmits():
+    status = {"a.test": 500, "b.test": 200}
+
+    def handler(request):
+        assert request.url.path == "/r/all.js"
+        return httpx.Response(status[request.url.host], json={})
+
+    client = pool_client(handler)
+    a, b = client.backends
+
+    await client.check_health()
+    assert not a.healthy and b.healthy
+
+    status["a.test"] = 200
+    await client.check_health()
+    assert a.healthy
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_health_checks_only_run_for_pools():
+    from redlib_mcp import RedlibClient
+
+    single = RedlibClient("http://a.test")
+    single.start_health_checks()
+    assert single._health_task is None
+
+    pool = RedlibClient(["http://a.test", "http://b.test"], health_check_interval=60)
+    pool.start_health_checks()
+    assert pool._health_task is not None
+    await pool.aclose()
+    assert pool._health_task is None
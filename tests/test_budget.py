@@ -0,0 +1,135 @@
+import copy
+import json
+import pytest
+from unittest.mock import AsyncMock, patch
+
+
+def comment(id: str, score: int, body: str = "text", replies: list | None = None) -> dict:
+    return {"id": id, "body": body, "author": "u", "score": score, "replies": replies or []}
+
+
+THREAD = {
+    "post": {"id": "abc123", "title": "Thread", "body": "p" * 1000, "author": "op"},
+    "comments": [
+        comment("top1", 50, replies=[comment("r1", 10, replies=[comment("deep", 99)]), comment("r2", 1)]),
+        comment("top2", 5),
+        comment("top3", 20, body="b" * 600),
+    ],
+}
+
+
+def ids(comments: list) -> list:
+    return [c.get("id", "more") for c in comments]
+
+
+def test_budget_chars():
+    from redlib_mcp import budget_chars
+
+    assert budget_chars() is None
+    assert budget_chars(max_chars=1000) == 1000
+    assert budget_chars(max_tokens=100) == 400
+    assert budget_chars(max_chars=300, max_tokens=100) == 300
+
+
+def test_fit_to_budget_leaves_small_output_alone():
+    from redlib_mcp import fit_to_budget, json_dumps
+
+    data = copy.deepcopy(THREAD)
+    assert fit_to_budget(data, 100_000) == json_dumps(THREAD)
+
+
+def test_deepest_then_lowest_score_comments_go_first():
+    from redlib_mcp import fit_to_budget, json_dumps
+
+    full = len(json_dumps(THREAD))
+    data = copy.deepcopy(THREAD)
+    output = fit_to_budget(data, full - 15)
+    result = json.loads(output)
+
+    assert len(output) <= full - 15
+    # The depth-3 reply goes before anything shallower
+    r1 = result["comments"][0]["replies"][0]
+    assert ids(r1["replies"]) == ["more"]
+    assert r1["replies"][0]["count"] == 1
+
+    data = copy.deepcopy(THREAD)
+    result = json.loads(fit_to_budget(data, full - 60))
+    # Then the lower-scored depth-2 reply
+    assert ids(result["comments"][0]["replies"]) == ["r1", "more"]
+
+
+def test_long_text_is_truncated_after_comments_are_gone():
+    from redlib_mcp import BUDGET_MIN_TEXT, fit_to_budget
+
+    data = copy.deepcopy(THREAD)
+    output = fit_to_budget(data, 900)
+    result = json.loads(output)
+
+    assert len(output) <= 900
+    assert ids(result["comments"]) == ["more"]
+    assert result["comments"][0]["count"] == 3
+    assert result["post"]["body"].endswith("…")
+    assert len(result["post"]["body"]) >= BUDGET_MIN_TEXT
+
+
+@pytest.mark.parametrize("max_chars", range(300, 2200, 37))
+def test_size_accounting_matches_output(max_chars):
+    from redlib_mcp import fit_to_budget
+
+    output = fit_to_budget(copy.deepcopy(THREAD), max_chars)
+
+    # Everything that can be pruned is gone before the budget is exceeded
+    assert len(output) <= max(max_chars, 350)
+
+
+def test_wide_thread_keeps_highest_scored_comments():
+    from redlib_mcp import fit_to_budget
+
+    data = {"comments": [comment(f"c{i}", score=i) for i in range(5000)]}
+    output = fit_to_budget(data, 2000)
+    result = json.loads(output)
+
+    assert len(output) <= 2000
+    kept, marker = result["comments"][:-1], result["comments"][-1]
+    assert marker == {"kind": "more", "count": 5000 - len(kept)}
+    assert ids(kept) == [f"c{i}" for i in range(5000 - len(kept), 5000)]
+
+
+def test_listing_drops_trailing_posts_and_moves_cursor():
+    from redlib_mcp import fit_to_budget
+
+    data = {"data": {"posts": [{"id": f"p{i}", "title": "t" * 100} for i in range(10)], "after": "t3_p9"}}
+    output = fit_to_budget(data, 600)
+    result = json.loads(output)
+
+    assert len(output) <= 600
+    posts = result["data"]["posts"]
+    assert 1 <= len(posts) < 10
+    assert result["data"]["after"] == f"t3_{posts[-1]['id']}"
+
+
+@pytest.mark.asyncio
+async def test_get_post_respects_max_tokens():
+    from redlib_mcp import get_post
+
+    payload = {"post": {"id": "abc123", "title": "Thread", "author": {"name": "op"}}, "comments": THREAD["comments"]}
+
+    with patch("redlib_mcp.client") as mock_client:
+        mock_client.get = AsyncMock(return_value=payload)
+        unbounded = await get_post.fn("abc123")
+        bounded = await get_post.fn("abc123", max_tokens=100)
+
+    assert len(bounded) <= 400 < len(unbounded)
+    assert json.loads(bounded)["post"]["id"] == "abc123"
+
+
+@pytest.mark.asyncio
+async def test_batch_budget_is_split_between_items():
+    from redlib_mcp import get_posts_batch
+
+    with patch("redlib_mcp.client") as mock_client:
+        mock_client.get = AsyncMock(return_value=copy.deepcopy(THREAD))
+        output = await get_posts_batch.fn(["a", "b"], max_chars=2000)
+
+    assert len(output) <= 2000
+    assert len(json.loads(output)["results"]) == 2
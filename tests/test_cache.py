@@ -0,0 +1,250 @@
+import time
+import pytest
+import httpx
+from unittest.mock import AsyncMock, patch
+
+from tests.helpers import make_response
+
+
+class TestResponseCache:
+    def test_key_sorts_params(self):
+        from redlib_mcp import ResponseCache
+
+        a = ResponseCache.key("/r/rust/top", {"t": "week", "after": "abc"})
+        b = ResponseCache.key("/r/rust/top/", {"after": "abc", "t": "week"})
+
+        assert a == b
+        assert ResponseCache.key("/r/rust/hot", None) == "/r/rust/hot"
+        assert ResponseCache.key("/r/rust/hot", {"after": None}) == "/r/rust/hot"
+
+    def test_ttl_per_endpoint(self):
+        from redlib_mcp import ResponseCache
+
+        cache = ResponseCache(default_ttl=42)
+
+        assert cache.ttl_for("/r/rust/wiki/index") == 6 * 60 * 60
+        assert cache.ttl_for("/r/rust/new") == 15
+        assert cache.ttl_for("/r/newzealand/hot") == 42
+
+    def test_hit_and_miss_counters(self):
+        from redlib_mcp import ResponseCache
+
+        cache = ResponseCache()
+        assert cache.get("a") is None
+        cache.set("a", {"x": 1}, size=10, ttl=60)
+
+        assert cache.get("a") == {"x": 1}
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_expiry(self):
+        from redlib_mcp import ResponseCache
+
+        cache = ResponseCache()
+        with patch("redlib_mcp.time.monotonic", return_value=100.0):
+            cache.set("a", {"x": 1}, size=10, ttl=5)
+        with patch("redlib_mcp.time.monotonic", return_value=106.0):
+            assert cache.get("a") is None
+
+        assert cache.stats()["expirations"] == 1
+        assert cache.stats()["entries"] == 0
+
+    def test_lru_eviction_by_entries(self):
+        from redlib_mcp import ResponseCache
+
+        cache = ResponseCache(max_entries=2)
+        cache.set("a", 1, size=1, ttl=60)
+        cache.set("b", 2, size=1, ttl=60)
+        cache.get("a")  # a is now most recently used
+        cache.set("c", 3, size=1, ttl=60)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_lru_eviction_by_bytes(self):
+        from redlib_mcp import ResponseCache
+
+        cache = ResponseCache(max_bytes=100)
+        cache.set("a", 1, size=60, ttl=60)
+        cache.set("b", 2, size=60, ttl=60)
+
+        assert cache.get("a") is None
+        assert cache.stats()["bytes"] == 60
+
+
+@pytest.mark.asyncio
+async def test_client_serves_repeat_requests_from_cache():
+    from redlib_mcp import RedlibClient, ResponseCache
+
+    client = RedlibClient("http://localhost:8080", cache=ResponseCache())
+    mock_get = AsyncMock(return_value=make_response(200, {"data": {"posts": []}}))
+
+    with patch("httpx.AsyncClient.get", mock_get):
+        first = await client.get("/r/rust/hot", params={"after": "x", "t": "day"})
+        second = await client.get("/r/rust/hot", params={"t": "day", "after": "x"})
+
+    assert first == second
+    assert mock_get.call_count == 1
+    assert client.cache.stats()["hits"] == 1
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_client_does_not_cache_errors():
+    from redlib_mcp import RedlibClient, ResponseCache
+
+    client = RedlibClient("http://localhost:8080", cache=ResponseCache())
+    mock_get = AsyncMock(return_value=make_response(500, {"error": "boom"}))
+
+    with patch("httpx.AsyncClient.get", mock_get):
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                await client.get("/r/rust/hot")
+
+    assert mock_get.call_count == 2
+    assert client.cache.stats()["entries"] == 0
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_client_revalidates_with_etag_and_serves_304_from_cache():
+    from redlib_mcp import RedlibClient, ResponseCache
+
+    seen_headers = []
+
+    def handler(request):
+        seen_headers.append(dict(request.headers))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(200, json={"data": {"content": "wiki"}},
+                              headers={"ETag": '"v1"', "Last-Modified": "Wed, 21 Oct 2026 07:28:00 GMT"})
+
+    cache = ResponseCache(stale_ttl=0)
+    client = RedlibClient("http://localhost:8080", cache=cache)
+    client._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    with patch("redlib_mcp.time.monotonic", return_value=100.0):
+        assert await client.get("/r/rust/comments/abc") == {"data": {"content": "wiki"}}
+    with patch("redlib_mcp.time.monotonic", return_value=100.0 + 10_000):
+        assert await client.get("/r/rust/comments/abc") == {"data": {"content": "wiki"}}
+        # The 304 made the entry fresh again
+        assert cache.peek("/r/rust/comments/abc").fresh
+
+    assert "if-none-match" not in seen_headers[0]
+    assert seen_headers[1]["if-none-match"] == '"v1"'
+    assert seen_headers[1]["if-modified-since"] == "Wed, 21 Oct 2026 07:28:00 GMT"
+    assert client.not_modified == 1
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_client_serves_stale_wiki_while_revalidating():
+    import asyncio
+    from redlib_mcp import RedlibClient, ResponseCache
+
+    versions = iter(["old", "new"])
+
+    def handler(request):
+        return httpx.Response(200, json={"data": {"content": next(versions)}})
+
+    cache = ResponseCache(stale_ttl=300)
+    client = RedlibClient("http://localhost:8080", cache=cache)
+    client._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    await client.get("/r/rust/wiki/index")
+    expired = time.monotonic() + cache.ttl_for("/r/rust/wiki/index") + 1
+    with patch("redlib_mcp.time.monotonic", return_value=expired):
+        stale = await client.get("/r/rust/wiki/index")
+        assert stale == {"data": {"content": "old"}}
+        assert client.revalidations == 1
+        # Let the background refresh finish
+        await asyncio.gather(*client._inflight.values())
+    assert await client.get("/r/rust/wiki/index") == {"data": {"content": "new"}}
+    assert cache.stats()["stale_hits"] == 1
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_client_does_not_serve_stale_for_post_threads():
+    from redlib_mcp import RedlibClient, ResponseCache
+
+    versions = iter(["old", "new"])
+    cache = ResponseCache(stale_ttl=300)
+    client = RedlibClient("http://localhost:8080", cache=cache)
+    client._http = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, json={"v": next(versions)}))
+    )
+
+    await client.get("/comments/abc")
+    expired = time.monotonic() + cache.ttl_for("/comments/abc") + 1
+    with patch("redlib_mcp.time.monotonic", return_value=expired):
+        assert await client.get("/comments/abc") == {"v": "new"}
+    await client.aclose()
+
+
+class TestDiskCache:
+    def test_round_trip_and_expiry(self, tmp_path):
+        from redlib_mcp import DiskCache
+
+        cache = DiskCache(tmp_path / "cache.sqlite3")
+        cache.set("a", b'{"x":1}', ttl=60)
+        with patch("redlib_mcp.time.time", return_value=time.time() + 61):
+            assert cache.get("a") is None
+
+        body, expires_at = cache.get("a")
+        assert body == b'{"x":1}'
+        assert expires_at > time.time()
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+        cache.close()
+
+    def test_shared_between_connections(self, tmp_path):
+        from redlib_mcp import DiskCache
+
+        writer = DiskCache(tmp_path / "cache.sqlite3")
+        reader = DiskCache(tmp_path / "cache.sqlite3")
+        writer.set("a", b"1", ttl=60)
+
+        assert reader.get("a")[0] == b"1"
+        writer.close()
+        reader.close()
+
+    def test_compact_drops_expired_and_oldest(self, tmp_path):
+        from redlib_mcp import DiskCache
+
+        cache = DiskCache(tmp_path / "cache.sqlite3", max_bytes=10)
+        now = time.time()
+        with patch("redlib_mcp.time.time", return_value=now):
+            cache.set("expired", b"x", ttl=1)
+            cache.set("old", b"12345", ttl=60)
+        with patch("redlib_mcp.time.time", return_value=now + 2):
+            cache.set("new", b"123456", ttl=60)
+            cache.compact()
+            assert cache.get("new") is not None
+            assert cache.get("old") is None
+
+        assert cache.stats()["entries"] == 1
+        cache.close()
+
+
+@pytest.mark.asyncio
+async def test_client_uses_disk_cache_as_l2(tmp_path):
+    from redlib_mcp import DiskCache, RedlibClient, ResponseCache
+
+    mock_get = AsyncMock(return_value=make_response(200, {"data": {"posts": [{"id": "1"}]}}))
+    with patch("httpx.AsyncClient.get", mock_get):
+        first = RedlibClient("http://localhost:8080", cache=ResponseCache(), disk_cache=DiskCache(tmp_path / "c.db"))
+        await first.get("/r/rust/hot")
+        await first.aclose()
+
+        # A fresh process with an empty memory cache is served from disk
+        second = RedlibClient("http://localhost:8080", cache=ResponseCache(), disk_cache=DiskCache(tmp_path / "c.db"))
+        result = await second.get("/r/rust/hot")
+        again = await second.get("/r/rust/hot")
+
+    assert result == again == {"data": {"posts": [{"id": "1"}]}}
+    assert mock_get.call_count == 1
+    assert second.cache.stats()["hits"] == 1
+    await second.aclose()
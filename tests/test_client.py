@@ -2,11 +2,7 @@ import pytest
 import httpx
 from unittest.mock import AsyncMock, patch
 
-
-def make_response(status_code: int, json_data: dict) -> httpx.Response:
-    """Create a properly configured httpx.Response for testing."""
-    request = httpx.Request("GET", "http://test.com")
-    return httpx.Response(status_code, json=json_data, request=request)
+from tests.helpers import make_response
 
 
 @pytest.mark.asyncio
@@ -70,3 +66,91 @@ async def test_client_passes_query_params():
 
     call_kwargs = mock_get.call_args[1]
     assert call_kwargs["params"] == {"sort": "new", "after": "abc123"}
+
+
+@pytest.mark.asyncio
+async def test_client_reuses_connection_pool():
+    from redlib_mcp import RedlibClient
+
+    client = RedlibClient("http://localhost:8080")
+
+    mock_response = make_response(200, {"data": None, "error": None})
+
+    with patch("httpx.AsyncClient.get", new_callable=AsyncMock, return_value=mock_response):
+        await client.get("/r/rust")
+        pool = client._http
+        await client.get("/r/python")
+
+    assert pool is not None
+    assert client._http is pool
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_client_aclose_releases_pool():
+    from redlib_mcp import RedlibClient
+
+    client = RedlibClient("http://localhost:8080", max_connections=5, keepalive_expiry=10)
+    pool = client.open()
+
+    await client.aclose()
+
+    assert pool.is_closed
+    assert client._http is None
+    # Reopens lazily after close
+    assert not client.open().is_closed
+    await client.aclose()
+
+
+def test_client_http2_falls_back_without_h2():
+    from redlib_mcp import RedlibClient
+
+    with patch.dict("sys.modules", {"h2": None}):
+        client = RedlibClient("http://localhost:8080", http2=True)
+
+    assert client.http2 is False
+
+
+@pytest.mark.asyncio
+async def test_client_coalesces_concurrent_requests():
+    import asyncio
+    from redlib_mcp import RedlibClient
+
+    client = RedlibClient("http://localhost:8080")
+    release = asyncio.Event()
+
+    async def slow_get(*args, **kwargs):
+        await release.wait()
+        return make_response(200, {"data": {"post": {"id": "abc"}}})
+
+    mock_get = AsyncMock(side_effect=slow_get)
+
+    with patch("httpx.AsyncClient.get", mock_get):
+        callers = [asyncio.create_task(client.get("/comments/abc")) for _ in range(10)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*callers)
+
+    assert mock_get.call_count == 1
+    assert client.coalesced == 9
+    assert all(r == {"data": {"post": {"id": "abc"}}} for r in results)
+    assert client._inflight == {}
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_client_coalesced_callers_share_errors():
+    import asyncio
+    from redlib_mcp import RedlibClient
+
+    client = RedlibClient("http://localhost:8080")
+    mock_get = AsyncMock(return_value=make_response(502, {"error": "bad gateway"}))
+
+    with patch("httpx.AsyncClient.get", mock_get):
+        results = await asyncio.gather(
+            client.get("/comments/abc"), client.get("/comments/abc"), return_exceptions=True
+        )
+
+    assert mock_get.call_count == 1
+    assert all(isinstance(r, httpx.HTTPStatusError) for r in results)
+    await client.aclose()
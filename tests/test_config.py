@@ -133,3 +133,105 @@ def test_create_server_without_auth(monkeypatch):
     server = create_authenticated_server()
 
     assert server is not None
+
+
+class TestLoadClientConfig:
+    def test_defaults(self, tmp_path, monkeypatch):
+        from redlib_mcp import load_client_config
+
+        for key in ("REDLIB_MAX_CONNECTIONS", "REDLIB_MAX_KEEPALIVE", "REDLIB_KEEPALIVE_EXPIRY",
+                    "REDLIB_HTTP2", "REDLIB_TIMEOUT"):
+            monkeypatch.delenv(key, raising=False)
+
+        with patch.object(Path, "home", return_value=tmp_path):
+            config = load_client_config()
+
+        assert config["max_connections"] == 100
+        assert config["max_keepalive_connections"] == 20
+        assert config["keepalive_expiry"] == 30.0
+        assert config["http2"] is False
+
+    def test_env_and_config_file(self, tmp_path, monkeypatch):
+        from redlib_mcp import load_client_config
+
+        monkeypatch.setenv("REDLIB_MAX_CONNECTIONS", "8")
+        monkeypatch.delenv("REDLIB_HTTP2", raising=False)
+
+        config_dir = tmp_path / ".config" / "redlib"
+        config_dir.mkdir(parents=True)
+        (config_dir / "config.json").write_text(json.dumps({"REDLIB_HTTP2": True, "REDLIB_MAX_CONNECTIONS": 50}))
+
+        with patch.object(Path, "home", return_value=tmp_path):
+            config = load_client_config()
+
+        assert config["max_connections"] == 8
+        assert config["http2"] is True
+
+
+def test_load_cache_config_disabled(monkeypatch):
+    """Setting REDLIB_CACHE_ENTRIES=0 disables the response cache."""
+    monkeypatch.setenv("REDLIB_CACHE_ENTRIES", "0")
+
+    from redlib_mcp import load_cache_config
+
+    assert load_cache_config() is None
+
+
+def test_load_disk_cache_config(tmp_path, monkeypatch):
+    """The disk cache is opt-in and lives under REDLIB_CACHE_DIR."""
+    from redlib_mcp import load_disk_cache_config
+
+    with patch("redlib_mcp.read_config_file", return_value={}):
+        assert load_disk_cache_config() is None
+
+        monkeypatch.setenv("REDLIB_DISK_CACHE", "true")
+        monkeypatch.setenv("REDLIB_CACHE_DIR", str(tmp_path))
+        config = load_disk_cache_config()
+
+    assert config["path"] == tmp_path / "cache.sqlite3"
+    assert config["max_bytes"] == 256 * 1024 * 1024
+
+
+def test_load_offload_config(monkeypatch):
+    """Offloading is on by default above 1 MiB and disabled by a zero threshold."""
+    from redlib_mcp import load_offload_config
+
+    with patch("redlib_mcp.read_config_file", return_value={}):
+        assert load_offload_config() == {"threshold": 1024 * 1024, "workers": 2, "pool": "thread"}
+
+        monkeypatch.setenv("REDLIB_OFFLOAD_POOL", "fibers")
+        assert load_offload_config()["pool"] == "thread"
+
+        monkeypatch.setenv("REDLIB_OFFLOAD_THRESHOLD", "0")
+        assert load_offload_config() is None
+
+
+def test_load_rate_limit_config(monkeypatch):
+    """Rate limiting reads its settings from the environment and can be disabled."""
+    monkeypatch.setenv("REDLIB_RATE_LIMIT", "5")
+    monkeypatch.setenv("REDLIB_MAX_CONCURRENCY", "4")
+
+    from redlib_mcp import load_rate_limit_config
+
+    config = load_rate_limit_config()
+    assert config["rate"] == 5.0
+    assert config["max_concurrency"] == 4
+
+    monkeypatch.setenv("REDLIB_RATE_LIMIT", "0")
+    monkeypatch.setenv("REDLIB_MAX_CONCURRENCY", "0")
+    assert load_rate_limit_config() is None
+
+
+def test_split_rate_limits(monkeypatch):
+    """Limits are divided between workers, keeping at least one burst token each."""
+    monkeypatch.setenv("REDLIB_RATE_LIMIT", "3")
+    monkeypatch.setenv("REDLIB_RATE_BURST", "2")
+    monkeypatch.setenv("REDLIB_MAX_CONCURRENCY", "0")
+
+    from redlib_mcp import load_rate_limit_config, split_rate_limits
+
+    split_rate_limits(4)
+    assert load_rate_limit_config() == {"rate": 0.75, "burst": 1, "max_concurrency": 0}
+
+    split_rate_limits(1)
+    assert load_rate_limit_config()["rate"] == 0.75
@@ -0,0 +1,75 @@
+import json
+import pytest
+from unittest.mock import AsyncMock, patch
+
+
+LISTING = {
+    "data": {
+        "posts": [
+            {"id": "1", "title": "First", "body": "long body", "score": 10, "url": "https://x", "thumbnail": "t"},
+            {"id": "2", "title": "Second", "body": "more", "score": 3, "url": "https://y", "thumbnail": "t"},
+        ],
+        "after": "t3_2",
+    }
+}
+
+
+def test_parse_fields_normalizes_and_keeps_id():
+    from redlib_mcp import parse_fields
+
+    assert parse_fields(None) is None
+    assert parse_fields([]) is None
+    assert parse_fields(["title", "score", "title"]) == ("id", "score", "title")
+
+
+def test_parse_fields_rejects_unknown_fields():
+    from redlib_mcp import parse_fields
+
+    with pytest.raises(ValueError, match="Unknown fields: bogus"):
+        parse_fields(["title", "bogus"])
+
+
+def test_projection_plans_are_cached_and_ordered():
+    from redlib_mcp import POST_FIELD_ORDER, projection
+
+    plan = projection(POST_FIELD_ORDER, ("id", "score", "title"))
+    assert plan == ("id", "title", "score")
+    assert projection(POST_FIELD_ORDER, ("id", "score", "title")) is plan
+    assert projection(POST_FIELD_ORDER, None) is POST_FIELD_ORDER
+
+
+def test_strip_response_projects_posts_and_comments():
+    from redlib_mcp import strip_response
+
+    data = {
+        "post": {"id": "p", "title": "T", "body": "B", "author": {"name": "op"}},
+        "comments": [{"id": "c", "body": "hi", "author": {"name": "u"}, "score": 1, "replies": []}],
+    }
+    result = strip_response(data, fields=("author", "id"))
+
+    assert result["post"] == {"id": "p", "author": "op"}
+    assert result["comments"] == [{"id": "c", "author": "u", "replies": []}]
+
+
+@pytest.mark.asyncio
+async def test_get_subreddit_fields():
+    from redlib_mcp import get_subreddit
+
+    with patch("redlib_mcp.client") as mock_client:
+        mock_client.get = AsyncMock(return_value=LISTING)
+        result = json.loads(await get_subreddit.fn("rust", fields=["title"]))
+
+    assert result["data"]["posts"] == [{"id": "1", "title": "First"}, {"id": "2", "title": "Second"}]
+    assert result["data"]["after"] == "t3_2"
+
+
+@pytest.mark.asyncio
+async def test_paginated_fields_keep_cursor():
+    from redlib_mcp import search_reddit
+
+    with patch("redlib_mcp.client") as mock_client:
+        mock_client.get = AsyncMock(return_value=LISTING)
+        result = json.loads(await search_reddit.fn("rust", max_items=1, fields=["score"]))
+
+    assert result["data"]["posts"] == [{"id": "1", "score": 10}]
+    assert result["data"]["after"] == "t3_1"
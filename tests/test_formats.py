@@ -0,0 +1,82 @@
+import csv
+import io
+import json
+import pytest
+from unittest.mock import AsyncMock, patch
+
+
+LISTING = {
+    "data": {
+        "subreddit": {"name": "rust"},
+        "posts": [
+            {"id": str(i), "title": f"Post, number {i}", "author": {"name": f"user{i}"}, "score": i, "nsfw": False}
+            for i in range(25)
+        ],
+        "after": "t3_24",
+    }
+}
+
+
+async def fetch_subreddit(**kwargs) -> str:
+    from redlib_mcp import get_subreddit
+
+    with patch("redlib_mcp.client") as mock_client:
+        mock_client.get = AsyncMock(return_value=LISTING)
+        return await get_subreddit.fn("rust", **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_table_format_is_column_wise_and_smaller():
+    default = await fetch_subreddit()
+    table = await fetch_subreddit(format="table")
+    result = json.loads(table)
+
+    posts = result["data"]["posts"]
+    assert posts["columns"] == ["id", "title", "author", "score", "nsfw"]
+    assert posts["rows"][0] == ["0", "Post, number 0", "user0", 0, False]
+    assert len(posts["rows"]) == 25
+    assert result["data"]["after"] == "t3_24"
+    assert result["data"]["subreddit"] == {"name": "rust"}
+    assert len(table) < len(default) * 0.6
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("output_format,delimiter", [("csv", ","), ("tsv", "\t")])
+async def test_delimited_formats(output_format, delimiter):
+    output = await fetch_subreddit(format=output_format)
+    lines = output.splitlines()
+
+    assert lines[-1] == "# after: t3_24"
+    rows = list(csv.reader(io.StringIO("\n".join(lines[:-1])), delimiter=delimiter))
+    assert rows[0] == ["id", "title", "author", "score", "nsfw"]
+    assert rows[1] == ["0", "Post, number 0", "user0", "0", "False"]
+    assert len(rows) == 26
+
+
+@pytest.mark.asyncio
+async def test_default_format_unchanged():
+    from redlib_mcp import json_dumps, strip_response
+
+    assert await fetch_subreddit() == json_dumps(strip_response(LISTING))
+
+
+@pytest.mark.asyncio
+async def test_table_respects_fields_and_budget():
+    output = await fetch_subreddit(format="table", fields=["title"], max_chars=400)
+    posts = json.loads(output)["data"]["posts"]
+
+    assert len(output) <= 400
+    assert posts["columns"] == ["id", "title"]
+    assert 1 <= len(posts["rows"]) < 25
+
+
+@pytest.mark.asyncio
+async def test_unknown_format_rejected():
+    with pytest.raises(ValueError, match="Unknown format"):
+        await fetch_subreddit(format="xml")
+
+
+def test_non_listing_stays_json():
+    from redlib_mcp import render_output
+
+    assert json.loads(render_output({"content": "wiki"}, "csv")) == {"content": "wiki"}
@@ -0,0 +1,97 @@
+import json
+import pytest
+from unittest.mock import AsyncMock, patch
+
+
+PAYLOAD = {
+    "data": {
+        "post": {
+            "id": "abc123",
+            "title": "Ünïcode \"quoted\" title",
+            "author": {"name": "poster"},
+            "score": 42,
+            "upvote_ratio": 0.97,
+            "created": 1700000000.0,
+            "nsfw": False,
+            "thumbnail": None,
+        },
+        "comments": [{"id": "c1", "body": "🦀 line\nbreak", "author": {"name": "x"}, "replies": []}],
+        "after": None,
+    },
+    "error": None,
+}
+
+
+def available_backends():
+    import redlib_mcp
+
+    backends = ["json"]
+    if redlib_mcp.orjson is not None:
+        backends.append("orjson")
+    if redlib_mcp.msgspec is not None:
+        backends.append("msgspec")
+    return backends
+
+
+@pytest.fixture(params=available_backends())
+def backend(request):
+    import redlib_mcp
+
+    previous = redlib_mcp.json_backend
+    yield redlib_mcp.set_json_backend(request.param)
+    redlib_mcp.set_json_backend(previous)
+
+
+def test_backends_emit_identical_output(backend):
+    import redlib_mcp
+
+    assert redlib_mcp.json_dumps(PAYLOAD) == json.dumps(PAYLOAD, separators=(",", ":"), ensure_ascii=False)
+    assert redlib_mcp.json_loads(json.dumps(PAYLOAD).encode()) == PAYLOAD
+
+
+def test_float_formatting_may_differ_but_values_match(backend):
+    import redlib_mcp
+
+    floats = [1e16, 2.5e-7, 1e-5, 0.1, 123.456]
+    assert json.loads(redlib_mcp.json_dumps(floats)) == floats
+
+
+def test_non_finite_floats_never_emitted_as_invalid_json(backend):
+    import redlib_mcp
+
+    try:
+        output = redlib_mcp.json_dumps({"score": float("nan")})
+    except ValueError:
+        assert backend == "json"
+    else:
+        assert output == '{"score":null}'
+
+
+@pytest.mark.asyncio
+async def test_tool_output_matches_across_backends(backend):
+    from redlib_mcp import get_post, strip_response
+
+    with patch("redlib_mcp.client") as mock_client:
+        mock_client.get = AsyncMock(return_value=PAYLOAD)
+        result = await get_post.fn("abc123")
+
+    assert json.loads(result) == strip_response(PAYLOAD)
+
+
+def test_unknown_backend_falls_back_to_stdlib():
+    import redlib_mcp
+
+    previous = redlib_mcp.json_backend
+    try:
+        assert redlib_mcp.set_json_backend("simdjson") == "json"
+    finally:
+        redlib_mcp.set_json_backend(previous)
+
+
+def test_fast_dumps_falls_back_on_unsupported_values():
+    from redlib_mcp import _fast_dumps
+
+    def reject(obj):
+        raise TypeError("unsupported")
+
+    assert _fast_dumps(reject)({"n": 1}) == '{"n":1}'
@@ -0,0 +1,102 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from tests.helpers import make_response
+
+prometheus_client = pytest.importorskip("prometheus_client")
+
+
+def sample(name: str, labels: dict) -> float:
+    from redlib_mcp import metrics_registry
+
+    return metrics_registry.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    import redlib_mcp
+
+    monkeypatch.setattr(redlib_mcp, "metrics_enabled", True)
+
+
+@pytest.mark.asyncio
+async def test_tool_phases_sizes_and_status_recorded(metrics):
+    from redlib_mcp import RedlibClient, get_post
+
+    client = RedlibClient("http://localhost:8080")
+    payload = {"post": {"id": "abc123", "title": "T", "extra": "x" * 500}, "comments": []}
+    phases = {
+        phase: sample("redlib_tool_phase_seconds_count", {"tool": "get_post", "phase": phase})
+        for phase in ("fetch", "strip", "serialize")
+    }
+    ok = sample("redlib_upstream_responses_total", {"status": "200"})
+    upstream = sample("redlib_response_size_bytes_sum", {"tool": "get_post", "stage": "upstream"})
+    output = sample("redlib_response_size_bytes_sum", {"tool": "get_post", "stage": "output"})
+
+    with patch("httpx.AsyncClient.get", AsyncMock(return_value=make_response(200, payload))), \
+            patch("redlib_mcp.client", client):
+        result = await get_post.fn("abc123")
+
+    for phase, count in phases.items():
+        assert sample("redlib_tool_phase_seconds_count", {"tool": "get_post", "phase": phase}) == count + 1
+    assert sample("redlib_upstream_responses_total", {"status": "200"}) == ok + 1
+    upstream_bytes = sample("redlib_response_size_bytes_sum", {"tool": "get_post", "stage": "upstream"}) - upstream
+    output_bytes = sample("redlib_response_size_bytes_sum", {"tool": "get_post", "stage": "output"}) - output
+    assert output_bytes == len(result) < upstream_bytes
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_middleware_counts_tool_calls(metrics):
+    from fastmcp import Client
+    from redlib_mcp import RedlibClient, server
+
+    before = sample("redlib_tool_calls_total", {"tool": "get_wiki", "status": "ok"})
+    failed = sample("redlib_tool_calls_total", {"tool": "get_wiki", "status": "error"})
+    responses = [make_response(200, {"content": "wiki"}), make_response(404, {})]
+
+    with patch("httpx.AsyncClient.get", AsyncMock(side_effect=responses)), \
+            patch("redlib_mcp.client", RedlibClient("http://localhost:8080")):
+        async with Client(server) as mcp:
+            await mcp.call_tool("get_wiki", {"subreddit": "rust"})
+            with pytest.raises(Exception):
+                await mcp.call_tool("get_wiki", {"subreddit": "missing"})
+
+    assert sample("redlib_tool_calls_total", {"tool": "get_wiki", "status": "ok"}) == before + 1
+    assert sample("redlib_tool_calls_total", {"tool": "get_wiki", "status": "error"}) == failed + 1
+    assert sample("redlib_tool_duration_seconds_count", {"tool": "get_wiki"}) >= 2
+
+
+def test_metrics_endpoint_serves_stats(monkeypatch):
+    from starlette.testclient import TestClient
+    from redlib_mcp import RateLimiter, RedlibClient, ResponseCache, create_authenticated_server
+
+    monkeypatch.delenv("ACCESS_CLIENT_ID", raising=False)
+    monkeypatch.delenv("ACCESS_CLIENT_SECRET", raising=False)
+    monkeypatch.setenv("MCP_METRICS_PATH", "/metrics")
+    client = RedlibClient(["http://a:8080", "http://b:8080"], cache=ResponseCache(), limiter=RateLimiter())
+
+    with patch("redlib_mcp.client", client):
+        app = create_authenticated_server().http_app()
+        with TestClient(app) as http:
+            response = http.get("/metrics")
+
+    assert response.status_code == 200
+    assert 'redlib_cache_entries{cache="response"} 0.0' in response.text
+    assert 'redlib_backend_healthy{backend="http://b:8080"} 1.0' in response.text
+    assert 'redlib_client_events_total{event="coalesced"} 0.0' in response.text
+    assert "redlib_upstream_throttled_total 0.0" in response.text
+    assert "redlib_upstream_max_wait_seconds 0.0" in response.text
+
+
+def test_metrics_endpoint_is_off_by_default(monkeypatch):
+    from starlette.testclient import TestClient
+    from redlib_mcp import RedlibClient, create_authenticated_server
+
+    monkeypatch.delenv("ACCESS_CLIENT_ID", raising=False)
+    monkeypatch.delenv("ACCESS_CLIENT_SECRET", raising=False)
+    monkeypatch.delenv("MCP_METRICS_PATH", raising=False)
+
+    with patch("redlib_mcp.client", RedlibClient("http://localhost:8080")):
+        with TestClient(create_authenticated_server().http_app()) as http:
+            assert http.get("/metrics").status_code == 404
@@ -0,0 +1,96 @@
+import json
+import pytest
+import httpx
+
+pytest.importorskip("msgspec")
+
+
+PAYLOAD = {
+    "data": {
+        "post": {
+            "id": "abc123",
+            "title": "Test",
+            "author": {"name": "poster", "flair": {"text": "x"}},
+            "awards": [{"name": "Gold"}],
+            "thumbnail": None,
+            "upvote_ratio": 0.5,
+        },
+        "comments": [
+            {
+                "id": "c1",
+                "body": "Hi",
+                "author": {"name": "commenter"},
+                "post_link": "removed",
+                "replies": [{"id": "c2", "author": "plain", "replies": [], "kind": "t1"}],
+            },
+            {"id": "c3", "replies": None},
+        ],
+        "posts": None,
+        "user": {"name": "ignored"},
+        "after": "cursor123",
+    },
+    "error": None,
+}
+
+
+def test_decode_stripped_matches_strip_response():
+    from redlib_mcp import decode_stripped, strip_response
+
+    assert decode_stripped(json.dumps(PAYLOAD).encode()) == strip_response(PAYLOAD)
+
+
+def test_decode_stripped_falls_back_for_unexpected_shapes():
+    from redlib_mcp import decode_stripped, strip_response
+
+    payload = {"data": ["not", "a", "dict"], "comments": [{"id": "c1", "replies": "oops"}]}
+
+    assert decode_stripped(json.dumps(payload).encode()) == strip_response(payload)
+
+
+def test_strip_post_uses_field_order():
+    from redlib_mcp import POST_FIELD_ORDER, strip_post
+
+    post = {"flair": None, "zzz": 1, "title": "T", "id": "1"}
+
+    assert list(strip_post(post)) == [f for f in POST_FIELD_ORDER if f in post]
+
+
+@pytest.mark.asyncio
+async def test_client_typed_decode():
+    from redlib_mcp import RedlibClient, strip_response
+
+    client = RedlibClient("http://localhost:8080", typed_decode=True)
+    client._http = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, json=PAYLOAD))
+    )
+
+    assert await client.get("/comments/abc123") == strip_response(PAYLOAD)
+    await client.aclose()
+
+
+def test_typed_results_are_not_stripped_twice():
+    from unittest.mock import patch
+    from redlib_mcp import StrippedResponse, decode_stripped, json_dumps, strip_and_serialize, strip_response
+
+    data = decode_stripped(json.dumps(PAYLOAD).encode())
+    expected = strip_response(PAYLOAD)
+    assert isinstance(data, StrippedResponse)
+
+    with patch("redlib_mcp.strip_response", wraps=strip_response) as strip:
+        assert strip_and_serialize(data, {}) == json_dumps(expected)
+        assert strip.call_count == 0
+
+        # Options and in-place pruning still work on a fresh copy
+        strip_and_serialize(data, {"max_depth": 1})
+        strip_and_serialize(data, {}, max_chars=50)
+        assert strip.call_count >= 2
+    assert data == expected
+
+
+def test_typed_decode_is_off_by_default(monkeypatch):
+    from unittest.mock import patch
+    from redlib_mcp import load_client_config
+
+    monkeypatch.delenv("REDLIB_TYPED_DECODE", raising=False)
+    with patch("redlib_mcp.read_config_file", return_value={}):
+        assert load_client_config()["typed_decode"] is False
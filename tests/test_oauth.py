@@ -89,3 +89,45 @@ def test_unauthenticated_server_allows_access(monkeypatch):
 
         # Should return 404 when auth is disabled (no OAuth endpoints)
         assert response.status_code == 404
+
+
+def test_create_app_is_stateless(monkeypatch):
+    """The worker app factory serves MCP requests without session affinity."""
+    monkeypatch.delenv("ACCESS_CLIENT_ID", raising=False)
+    monkeypatch.delenv("ACCESS_CLIENT_SECRET", raising=False)
+
+    from redlib_mcp import create_app
+
+    app = create_app()
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/mcp",
+            json={"jsonrpc": "2.0", "method": "tools/list", "id": 1},
+            headers={"Accept": "application/json, text/event-stream"},
+        )
+
+        # No initialize handshake or Mcp-Session-Id needed
+        assert response.status_code == 200
+        assert "get_subreddit" in response.text
+
+
+def test_main_server_starts_workers(monkeypatch):
+    """MCP_SERVER_WORKERS > 1 runs uvicorn with the app factory."""
+    monkeypatch.delenv("ACCESS_CLIENT_ID", raising=False)
+    monkeypatch.delenv("ACCESS_CLIENT_SECRET", raising=False)
+    monkeypatch.setenv("MCP_SERVER_WORKERS", "4")
+    monkeypatch.setenv("MCP_SERVER_PORT", "9000")
+    monkeypatch.setenv("REDLIB_RATE_LIMIT", "10")
+    monkeypatch.setenv("REDLIB_RATE_BURST", "20")
+    monkeypatch.setenv("REDLIB_MAX_CONCURRENCY", "16")
+
+    import redlib_mcp
+
+    with patch("uvicorn.run") as mock_run, patch("redlib_mcp.init_client") as mock_init:
+        redlib_mcp.main_server()
+
+    mock_run.assert_called_once_with("redlib_mcp:create_app", factory=True, host="0.0.0.0", port=9000, workers=4)
+    mock_init.assert_not_called()
+    # Each worker gets a quarter of the upstream limits
+    assert redlib_mcp.load_rate_limit_config() == {"rate": 2.5, "burst": 5, "max_concurrency": 4}
@@ -0,0 +1,64 @@
+import json
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from tests.helpers import make_response
+
+
+PAYLOAD = {
+    "post": {"id": "abc123", "title": "Big thread", "author": {"name": "op"}, "extra": "dropped"},
+    "comments": [{"id": f"c{i}", "body": "x" * 100, "author": {"name": "u"}, "replies": []} for i in range(50)],
+}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("threshold,expected", [(1, 1), (10 * 1024 * 1024, 0)])
+async def test_large_responses_are_stripped_in_pool(monkeypatch, threshold, expected):
+    import redlib_mcp
+    from redlib_mcp import Offloader, RedlibClient, get_post, strip_response
+
+    offloader = Offloader(threshold, workers=1)
+    monkeypatch.setattr(redlib_mcp, "offloader", offloader)
+    client = RedlibClient("http://localhost:8080")
+    mock_get = AsyncMock(return_value=make_response(200, PAYLOAD))
+
+    with patch("httpx.AsyncClient.get", mock_get), patch("redlib_mcp.client", client):
+        result = await get_post.fn("abc123")
+
+    assert json.loads(result) == strip_response(PAYLOAD)
+    assert offloader.offloaded == expected
+    assert client.response_size("/comments/abc123") > 0
+    offloader.shutdown()
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_process_pool_produces_same_output():
+    from redlib_mcp import Offloader, strip_and_serialize
+
+    offloader = Offloader(1, workers=1, pool="process")
+    try:
+        output = await offloader.run(strip_and_serialize, PAYLOAD, {"max_comments": 3})
+    finally:
+        offloader.shutdown()
+
+    assert output == strip_and_serialize(PAYLOAD, {"max_comments": 3})
+
+
+@pytest.mark.asyncio
+async def test_lifespan_shuts_down_pool(monkeypatch):
+    import redlib_mcp
+    from redlib_mcp import Offloader, RedlibClient, client_lifespan, server, strip_and_serialize
+
+    offloader = Offloader(1, workers=1)
+    monkeypatch.setattr(redlib_mcp, "offloader", offloader)
+
+    with patch("redlib_mcp.client", RedlibClient("http://localhost:8080")):
+        async with client_lifespan(server):
+            await offloader.run(strip_and_serialize, PAYLOAD, {})
+            assert offloader.executor is not None
+
+    assert offloader.executor is None
+    # The next run starts a new pool
+    assert await offloader.run(strip_and_serialize, PAYLOAD, {}) == strip_and_serialize(PAYLOAD, {})
+    offloader.shutdown()
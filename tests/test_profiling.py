@@ -0,0 +1,132 @@
+import json
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from tests.helpers import make_response
+
+
+def test_load_profiling_config(tmp_path, monkeypatch):
+    """Profiling is off by default; the rate is clamped and unknown modes fall back to cpu."""
+    from redlib_mcp import load_profiling_config
+
+    with patch("redlib_mcp.read_config_file", return_value={}):
+        config = load_profiling_config()
+        assert config["rate"] == 0
+        assert config["mode"] == "cpu"
+
+        monkeypatch.setenv("REDLIB_PROFILE_RATE", "250")
+        monkeypatch.setenv("REDLIB_PROFILE_MODE", "gpu")
+        monkeypatch.setenv("REDLIB_PROFILE_DIR", str(tmp_path))
+        config = load_profiling_config()
+
+    assert config == {"rate": 100.0, "mode": "cpu", "directory": tmp_path}
+
+
+def test_should_profile_respects_rate(tmp_path):
+    from redlib_mcp import Profiler
+
+    assert not Profiler(rate=0, directory=tmp_path).should_profile()
+    assert Profiler(rate=100, directory=tmp_path).should_profile()
+    with patch("redlib_mcp.random.random", return_value=0.3):
+        assert Profiler(rate=25, directory=tmp_path).should_profile() is False
+        assert Profiler(rate=35, directory=tmp_path).should_profile() is True
+
+
+def test_load_profiling_config_reads_file_once():
+    from redlib_mcp import load_profiling_config
+
+    with patch("redlib_mcp.read_config_file", return_value={"REDLIB_PROFILE_RATE": 5}) as read:
+        assert load_profiling_config()["rate"] == 5.0
+
+    assert read.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_reloading_picks_up_new_settings(tmp_path, monkeypatch):
+    """Settings changed while the server runs are re-read in the background, not per call."""
+    import asyncio
+    from redlib_mcp import Profiler
+
+    profiler = Profiler(rate=0, directory=tmp_path)
+    monkeypatch.setenv("REDLIB_PROFILE_RATE", "100")
+    monkeypatch.setenv("REDLIB_PROFILE_MODE", "memory")
+
+    with patch("redlib_mcp.read_config_file", return_value={}) as read, \
+            patch("redlib_mcp.PROFILE_RELOAD_SECONDS", 0.01):
+        assert not profiler.should_profile()
+        assert read.call_count == 0
+        profiler.start_reloading()
+        try:
+            for _ in range(100):
+                if profiler.should_profile():
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            profiler.stop_reloading()
+
+    assert profiler.should_profile()
+    assert profiler.mode == "memory"
+
+
+@pytest.mark.asyncio
+async def test_cpu_profile_written_with_tool_and_arguments(tmp_path):
+    import pstats
+    from redlib_mcp import Profiler
+
+    profiler = Profiler(rate=100, mode="cpu", directory=tmp_path)
+
+    async def call():
+        return sorted(range(1000), reverse=True)[0]
+
+    assert await profiler.profile("get_subreddit", {"subreddit": "rust"}, call) == 999
+
+    (record_file,) = tmp_path.glob("*-get_subreddit-*.json")
+    record = json.loads(record_file.read_text())
+    assert record["tool"] == "get_subreddit"
+    assert record["arguments"] == {"subreddit": "rust"}
+    assert record["status"] == "ok"
+    assert pstats.Stats(str(tmp_path / record["profile"])).total_calls > 0
+    assert profiler.profiled == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_profile_records_failures(tmp_path):
+    import tracemalloc
+    from redlib_mcp import Profiler
+
+    profiler = Profiler(rate=100, mode="memory", directory=tmp_path)
+
+    async def call():
+        data = [str(i) * 10 for i in range(10_000)]
+        raise ValueError(len(data))
+
+    with pytest.raises(ValueError):
+        await profiler.profile("get_post", {"post": "abc123"}, call)
+
+    (record_file,) = tmp_path.glob("*-get_post-*.json")
+    record = json.loads(record_file.read_text())
+    assert record["status"] == "error"
+    assert record["peak_traced_bytes"] > 100_000
+    assert record["top_allocations"]
+    assert not list(tmp_path.glob("*.prof"))
+    assert not tracemalloc.is_tracing()
+
+
+@pytest.mark.asyncio
+async def test_middleware_profiles_sampled_tool_calls(tmp_path, monkeypatch):
+    import redlib_mcp
+    from fastmcp import Client
+    from redlib_mcp import Profiler, RedlibClient, server
+
+    monkeypatch.setattr(redlib_mcp, "profiler", Profiler(rate=100, directory=tmp_path))
+
+    with patch("httpx.AsyncClient.get", AsyncMock(return_value=make_response(200, {"content": "wiki"}))), \
+            patch("redlib_mcp.client", RedlibClient("http://localhost:8080")):
+        async with Client(server) as mcp:
+            await mcp.call_tool("get_wiki", {"subreddit": "rust"})
+            redlib_mcp.profiler.rate = 0
+            await mcp.call_tool("get_wiki", {"subreddit": "python"})
+
+    (record_file,) = tmp_path.glob("*.json")
+    assert json.loads(record_file.read_text())["arguments"]["subreddit"] == "rust"
+    assert len(list(tmp_path.glob("*-get_wiki-*.prof"))) == 1
@@ -0,0 +1,115 @@
+import asyncio
+import time
+import pytest
+import httpx
+
+
+def test_parse_retry_after():
+    from email.utils import formatdate
+    from redlib_mcp import MAX_RETRY_AFTER, parse_retry_after
+
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after("100000") == MAX_RETRY_AFTER
+    assert 0 < parse_retry_after(formatdate(time.time() + 10, usegmt=True)) <= 10
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_token_bucket():
+    from redlib_mcp import RateLimiter
+
+    limiter = RateLimiter(rate=50, burst=1, max_concurrency=0)
+    start = time.monotonic()
+    for _ in range(3):
+        async with limiter.slot():
+            pass
+
+    # First request uses the burst token, the next two wait ~20ms each
+    assert time.monotonic() - start >= 0.035
+    assert limiter.stats()["acquired"] == 3
+    assert limiter.stats()["total_wait_seconds"] > 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_concurrency_cap_and_queue_depth():
+    from redlib_mcp import RateLimiter
+
+    limiter = RateLimiter(rate=0, max_concurrency=2)
+    peak = 0
+    depth = 0
+
+    async def worker():
+        nonlocal peak, depth
+        async with limiter.slot():
+            peak = max(peak, limiter.in_flight)
+            depth = max(depth, limiter.stats()["queue_depth"])
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(worker() for _ in range(6)))
+
+    assert peak == 2
+    assert depth > 0
+    assert limiter.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_try_acquire_never_waits():
+    from redlib_mcp import RateLimiter
+
+    limiter = RateLimiter(rate=1, burst=1, max_concurrency=2)
+
+    assert await limiter.try_acquire()
+    # The only token is gone
+    assert not await limiter.try_acquire()
+    limiter.release()
+    assert limiter.stats()["in_flight"] == 0
+
+    limiter = RateLimiter(rate=0, max_concurrency=1)
+    async with limiter.slot():
+        assert not await limiter.try_acquire()
+    assert await limiter.try_acquire()
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_block_for():
+    from redlib_mcp import RateLimiter
+
+    limiter = RateLimiter(rate=0, max_concurrency=0)
+    limiter.block_for(0.05)
+    start = time.monotonic()
+    async with limiter.slot():
+        pass
+
+    assert time.monotonic() - start >= 0.04
+    assert limiter.stats()["throttled"] == 1
+
+
+@pytest.mark.asyncio
+async def test_client_requeues_after_429_with_retry_after():
+    from redlib_mcp import RateLimiter, RedlibClient
+
+    responses = [
+        httpx.Response(429, headers={"Retry-After": "0"}, json={"error": "slow down"}),
+        httpx.Response(200, json={"data": {"posts": []}}),
+    ]
+    client = RedlibClient("http://localhost:8080", limiter=RateLimiter(rate=0, max_concurrency=4))
+    client._http = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: responses.pop(0)))
+
+    assert await client.get("/r/rust/hot") == {"data": {"posts": []}}
+    assert client.limiter.stats()["throttled"] == 1
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_client_surfaces_429_without_retry_after():
+    from redlib_mcp import RateLimiter, RedlibClient
+
+    client = RedlibClient("http://localhost:8080", limiter=RateLimiter(rate=0, max_concurrency=4))
+    client._http = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(429, json={}))
+    )
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.get("/r/rust/hot")
+    await client.aclose()
@@ -0,0 +1,171 @@
+import asyncio
+import pytest
+import httpx
+from unittest.mock import patch
+
+
+def mock_client(handler, **kwargs):
+    from redlib_mcp import RedlibClient
+
+    client = RedlibClient("http://localhost:8080", retry_backoff=0.001, **kwargs)
+    client._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+@pytest.mark.asyncio
+async def test_retries_5xx_then_succeeds():
+    statuses = [503, 502, 200]
+
+    def handler(request):
+        return httpx.Response(statuses.pop(0), json={"data": {"posts": []}})
+
+    client = mock_client(handler, retries=2)
+
+    assert await client.get("/r/rust/hot") == {"data": {"posts": []}}
+    assert client.retried == 2
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_retries_transport_errors():
+    calls = 0
+
+    def handler(request):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(200, json={"ok": True})
+
+    client = mock_client(handler, retries=1)
+
+    assert await client.get("/r/rust/hot") == {"ok": True}
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_retries():
+    calls = 0
+
+    def handler(request):
+        nonlocal calls
+        calls += 1
+        return httpx.Response(500, json={})
+
+    client = mock_client(handler, retries=2)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.get("/r/rust/hot")
+    assert calls == 3
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_does_not_retry_client_errors():
+    calls = 0
+
+    def handler(request):
+        nonlocal calls
+        calls += 1
+        return httpx.Response(404, json={})
+
+    client = mock_client(handler, retries=3)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.get("/r/doesnotexist/hot")
+    assert calls == 1
+    await client.aclose()
+
+
+def test_backoff_is_jittered_and_capped():
+    from redlib_mcp import RedlibClient
+
+    client = RedlibClient("http://localhost:8080", retries=10, retry_backoff=1, retry_max_backoff=3)
+    error = httpx.ConnectError("boom")
+
+    with patch("redlib_mcp.random.uniform", side_effect=lambda low, high: high) as uniform:
+        assert client._retry_delay(error, 0, None) == 1
+        assert client._retry_delay(error, 5, None) == 3
+        assert uniform.call_args[0][0] == 0
+    assert client._retry_delay(error, 10, None) is None
+
+
+@pytest.mark.asyncio
+async def test_hedged_request_wins_when_primary_is_slow():
+    from redlib_mcp import HEDGE_MIN_SAMPLES
+
+    calls = 0
+
+    async def slow_then_fast(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(1)
+            return {"from": "primary"}, 1, (None, None)
+        return {"from": "hedge"}, 1, (None, None)
+
+    client = mock_client(lambda request: httpx.Response(200, json={}), hedge=True)
+    client._latencies.extend([0.01] * HEDGE_MIN_SAMPLES)
+
+    with patch.object(client, "_request", side_effect=slow_then_fast):
+        result = await client.get("/comments/abc")
+
+    assert result == {"from": "hedge"}
+    assert client.hedges_sent == 1
+    assert client.hedges_won == 1
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_hedge_takes_its_own_limiter_slot():
+    from redlib_mcp import HEDGE_MIN_SAMPLES, RateLimiter
+
+    in_flight = []
+
+    async def slow_then_fast(*args, **kwargs):
+        in_flight.append(client.limiter.in_flight)
+        await asyncio.sleep(0.05 if len(in_flight) == 1 else 0)
+        return {"ok": True}, 1, (None, None)
+
+    limiter = RateLimiter(rate=0, max_concurrency=2)
+    client = mock_client(lambda request: httpx.Response(200, json={}), hedge=True, limiter=limiter)
+    client._latencies.extend([0.01] * HEDGE_MIN_SAMPLES)
+
+    with patch.object(client, "_request", side_effect=slow_then_fast):
+        await client.get("/comments/abc")
+
+    assert client.hedges_sent == 1
+    assert in_flight == [1, 2]
+    assert limiter.in_flight == 0
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_without_a_free_limiter_slot():
+    from redlib_mcp import HEDGE_MIN_SAMPLES, RateLimiter
+
+    async def slow(*args, **kwargs):
+        await asyncio.sleep(0.05)
+        return {"ok": True}, 1, (None, None)
+
+    limiter = RateLimiter(rate=0, max_concurrency=1)
+    client = mock_client(lambda request: httpx.Response(200, json={}), hedge=True, limiter=limiter)
+    client._latencies.extend([0.01] * HEDGE_MIN_SAMPLES)
+
+    with patch.object(client, "_request", side_effect=slow) as request:
+        assert await client.get("/comments/abc") == {"ok": True}
+
+    assert request.call_count == 1
+    assert client.hedges_sent == 0
+    await client.aclose()
+
+
+def test_no_hedge_until_enough_samples():
+    from redlib_mcp import HEDGE_MIN_SAMPLES, RedlibClient
+
+    client = RedlibClient("http://localhost:8080", hedge=True)
+    client._latencies.extend([0.2] * (HEDGE_MIN_SAMPLES - 1))
+    assert client.hedge_delay() is None
+
+    client._latencies.append(0.2)
+    assert client.hedge_delay() == pytest.approx(0.2)
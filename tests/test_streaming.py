@@ -0,0 +1,93 @@
+import json
+import pytest
+import httpx
+
+pytest.importorskip("ijson")
+
+
+PAYLOAD = {
+    "data": {
+        "post": {
+            "id": "abc123",
+            "title": "Test",
+            "author": {"name": "poster", "flair": {"text": "x"}},
+            "score": 1.5,
+            "awards": [{"name": "Gold", "nested": {"deep": [1, 2, 3]}}],
+            "flair": {"text": "Discussion", "color": "#fff"},
+        },
+        "comments": [
+            {
+                "id": "c1",
+                "body": "Hi",
+                "author": {"name": "commenter"},
+                "post_link": "removed",
+                "prefs": {"show_nsfw": True},
+                "replies": [
+                    {"id": "c2", "body": "Reply", "author": "plain", "replies": [], "kind": "t1"},
+                ],
+            },
+            {"id": "c3", "body": None, "author": {"flair": None}, "replies": None},
+        ],
+        "user": {"name": "ignored"},
+        "after": "cursor123",
+    },
+    "error": None,
+}
+
+
+def strip_streaming(payload, chunk_size: int):
+    from redlib_mcp import StreamingStripper
+
+    body = json.dumps(payload).encode()
+    stripper = StreamingStripper()
+    for i in range(0, len(body), chunk_size):
+        stripper.feed(body[i:i + chunk_size])
+    return stripper.close()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 20])
+def test_streaming_stripper_matches_strip_response(chunk_size):
+    from redlib_mcp import strip_response
+
+    result = strip_streaming(PAYLOAD, chunk_size)
+
+    assert json.dumps(result) == json.dumps(strip_response(PAYLOAD))
+
+
+def test_streaming_stripper_drops_non_list_arrays():
+    from redlib_mcp import strip_response
+
+    payload = {"posts": None, "comments": {"not": "a list"}, "data": None, "content": "# Wiki"}
+
+    assert strip_streaming(payload, 5) == strip_response(payload)
+
+
+@pytest.mark.asyncio
+async def test_client_streaming_fetch():
+    from redlib_mcp import RedlibClient, strip_response
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/comments/abc123.js"
+        return httpx.Response(200, content=json.dumps(PAYLOAD).encode())
+
+    client = RedlibClient("http://localhost:8080", streaming=True)
+    client._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    result = await client.get("/comments/abc123")
+
+    assert result == strip_response(PAYLOAD)
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_client_streaming_raises_on_error_status():
+    from redlib_mcp import RedlibClient
+
+    client = RedlibClient("http://localhost:8080", streaming=True)
+    client._http = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(503, content=b"{}"))
+    )
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.get("/comments/abc123")
+    await client.aclose()
@@ -1,6 +1,6 @@
 import json
 import pytest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 
 # Note: FastMCP wraps tools in FunctionTool objects.
@@ -425,6 +425,51 @@ class TestStripResponse:
         assert result["replies"][0]["author"] == "user2"
         assert "post_link" not in result["replies"][0]
 
+    def test_strip_comment_deep_thread_without_recursion(self):
+        from redlib_mcp import strip_comment
+
+        comment = {"id": "leaf", "replies": []}
+        for i in range(5000):
+            comment = {"id": str(i), "author": {"name": "u"}, "replies": [comment]}
+
+        result = strip_comment(comment)
+
+        depth = 0
+        while result["replies"]:
+            result = result["replies"][0]
+            depth += 1
+        assert depth == 5000
+        assert result["id"] == "leaf"
+
+    def test_strip_comments_max_depth(self):
+        from redlib_mcp import strip_comments
+
+        comments = [
+            {"id": "a", "replies": [
+                {"id": "b", "replies": [{"id": "c", "replies": []}, {"id": "d", "replies": []}]},
+            ]},
+        ]
+
+        result = strip_comments(comments, max_depth=2)
+
+        assert result[0]["replies"][0]["id"] == "b"
+        assert result[0]["replies"][0]["replies"] == [{"kind": "more", "count": 2}]
+
+    def test_strip_comments_max_comments(self):
+        from redlib_mcp import strip_comments
+
+        comments = [
+            {"id": "a", "replies": [{"id": "a1", "replies": []}, {"id": "a2", "replies": []}]},
+            {"id": "b", "replies": []},
+            {"id": "c", "replies": []},
+        ]
+
+        result = strip_comments(comments, max_comments=2)
+
+        assert [c.get("id") for c in result] == ["a", None]
+        assert result[0]["replies"] == [{"id": "a1", "replies": []}, {"kind": "more", "count": 1}]
+        assert result[1] == {"kind": "more", "count": 2}
+
     def test_strip_response_full(self):
         from redlib_mcp import strip_response
 
@@ -457,3 +502,260 @@ class TestStripResponse:
         assert "post_link" not in result["comments"][0]
         assert result["after"] == "cursor123"
         assert "error" not in result
+
+
+@pytest.mark.asyncio
+async def test_tool_output_cache_skips_refetch_and_strip():
+    import redlib_mcp
+    from redlib_mcp import ResponseCache, get_post
+
+    mock_data = {"data": {"post": {"id": "abc123", "title": "Test", "author": {"name": "poster"}}}}
+
+    with patch("redlib_mcp.output_cache", ResponseCache()), \
+            patch("redlib_mcp.client") as mock_client, \
+            patch("redlib_mcp.strip_response", wraps=redlib_mcp.strip_response) as mock_strip:
+        mock_client.get = AsyncMock(return_value=mock_data)
+        mock_client.expires_at = MagicMock(return_value=None)
+        first = await get_post.fn("abc123")
+        strip_calls = mock_strip.call_count
+        second = await get_post.fn("https://reddit.com/comments/abc123")
+
+        assert mock_client.get.call_count == 1
+        assert mock_strip.call_count == strip_calls
+        assert redlib_mcp.output_cache.stats()["hits"] == 1
+
+    assert first == second
+    assert json.loads(first)["data"]["post"]["author"] == "poster"
+
+
+@pytest.mark.asyncio
+async def test_tool_output_cache_keyed_by_tool():
+    from redlib_mcp import ResponseCache, get_subreddit, get_wiki
+
+    with patch("redlib_mcp.output_cache", ResponseCache()), \
+            patch("redlib_mcp.client") as mock_client:
+        mock_client.get = AsyncMock(return_value={"data": None})
+        mock_client.expires_at = MagicMock(return_value=None)
+        await get_subreddit.fn("rust")
+        await get_wiki.fn("rust")
+
+        assert mock_client.get.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_tool_output_not_cached_from_stale_response():
+    import asyncio
+    import time
+    import httpx
+    import redlib_mcp
+    from redlib_mcp import RedlibClient, ResponseCache, get_wiki
+
+    versions = iter(["OLD", "NEW"])
+
+    def handler(request):
+        return httpx.Response(200, json={"data": {"content": next(versions)}})
+
+    cache = ResponseCache(stale_ttl=300)
+    client = RedlibClient("http://localhost:8080", cache=cache, on_refresh=redlib_mcp.invalidate_output)
+    client._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    with patch("redlib_mcp.client", client), patch("redlib_mcp.output_cache", ResponseCache()):
+        assert "OLD" in await get_wiki.fn("rust")
+        expired = time.monotonic() + cache.ttl_for("/r/rust/wiki/index") + 1
+        with patch("redlib_mcp.time.monotonic", return_value=expired):
+            assert "OLD" in await get_wiki.fn("rust")
+            # Let the background refresh finish
+            await asyncio.gather(*client._inflight.values())
+            assert "NEW" in await get_wiki.fn("rust")
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("max_pages", [None, 2])
+async def test_tool_output_expires_with_its_response(max_pages):
+    import re
+    import time
+    import httpx
+    from redlib_mcp import RedlibClient, ResponseCache, get_subreddit
+
+    versions = iter(["OLD", "NEW"])
+
+    def handler(request):
+        return httpx.Response(200, json={"data": {"posts": [{"id": next(versions)}], "after": None}})
+
+    cache = ResponseCache(ttls=[(re.compile(r"^/r/"), 0.3)])
+    client = RedlibClient("http://localhost:8080", cache=cache)
+    client._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    with patch("redlib_mcp.client", client), patch("redlib_mcp.output_cache", ResponseCache()):
+        assert "OLD" in await get_subreddit.fn("rust", max_pages=max_pages)
+        with patch("redlib_mcp.time.monotonic", return_value=time.monotonic() + 1):
+            assert "NEW" in await get_subreddit.fn("rust", max_pages=max_pages)
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_get_post_comment_budgets():
+    from redlib_mcp import get_post
+
+    mock_data = {
+        "data": {
+            "post": {"id": "abc123"},
+            "comments": [
+                {"id": "c1", "replies": [{"id": "c2", "replies": []}]},
+                {"id": "c3", "replies": []},
+            ],
+        },
+    }
+
+    with patch("redlib_mcp.client") as mock_client:
+        mock_client.get = AsyncMock(return_value=mock_data)
+        result = json.loads(await get_post.fn("abc123", max_depth=1, max_comments=1))
+
+    assert result["data"]["comments"] == [
+        {"id": "c1", "replies": [{"kind": "more", "count": 1}]},
+        {"kind": "more", "count": 1},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_posts_batch_reports_per_item_errors():
+    import httpx
+    from redlib_mcp import get_posts_batch
+
+    async def fake_get(path, params=None):
+        if path == "/comments/bad":
+            request = httpx.Request("GET", "http://test.com/comments/bad.js")
+            raise httpx.HTTPStatusError("404 Not Found", request=request, response=httpx.Response(404, request=request))
+        return {"data": {"post": {"id": path.rsplit("/", 1)[-1], "author": {"name": "poster"}}}}
+
+    with patch("redlib_mcp.client") as mock_client:
+        mock_client.get = AsyncMock(side_effect=fake_get)
+        result = json.loads(await get_posts_batch.fn(["abc", "bad", "https://reddit.com/r/rust/comments/xyz"]))
+
+    results = result["results"]
+    assert [r["input"] for r in results] == ["abc", "bad", "https://reddit.com/r/rust/comments/xyz"]
+    assert results[0]["result"] == {"data": {"post": {"id": "abc", "author": "poster"}}}
+    assert "404" in results[1]["error"]
+    assert results[2]["result"]["data"]["post"]["id"] == "xyz"
+
+
+@pytest.mark.asyncio
+async def test_get_subreddits_batch_bounded_concurrency():
+    import asyncio
+    from redlib_mcp import BATCH_CONCURRENCY, get_subreddits_batch
+
+    active = 0
+    peak = 0
+
+    async def fake_get(path, params=None):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return {"data": {"posts": []}}
+
+    names = [f"sub{i}" for i in range(BATCH_CONCURRENCY * 2)]
+    with patch("redlib_mcp.client") as mock_client:
+        mock_client.get = AsyncMock(side_effect=fake_get)
+        result = json.loads(await get_subreddits_batch.fn(names, sort="top", time="week"))
+
+        assert mock_client.get.call_args[0][0].endswith("/top")
+        assert mock_client.get.call_args[1]["params"] == {"t": "week"}
+
+    assert len(result["results"]) == len(names)
+    assert peak == BATCH_CONCURRENCY
+
+
+@pytest.mark.asyncio
+async def test_batch_rejects_oversized_input():
+    from redlib_mcp import BATCH_MAX_ITEMS, get_posts_batch
+
+    with patch("redlib_mcp.client"):
+        with pytest.raises(ValueError):
+            await get_posts_batch.fn(["abc"] * (BATCH_MAX_ITEMS + 1))
+
+
+def make_listing_pages(page_count: int, per_page: int):
+    """Build fake Redlib listing pages keyed by their after cursor."""
+    pages = {}
+    for n in range(page_count):
+        cursor = None if n == 0 else f"t3_p{n - 1}_{per_page - 1}"
+        next_cursor = f"t3_p{n}_{per_page - 1}" if n < page_count - 1 else None
+        pages[cursor] = {
+            "data": {
+                "subreddit": {"name": "rust"},
+                "posts": [{"id": f"p{n}_{i}", "title": "t", "extra": "x"} for i in range(per_page)],
+                "after": next_cursor,
+            }
+        }
+    return pages
+
+
+@pytest.mark.asyncio
+async def test_get_subreddit_follows_pagination():
+    from unittest.mock import MagicMock
+    from redlib_mcp import get_subreddit
+
+    pages = make_listing_pages(3, 2)
+    ctx = MagicMock()
+    ctx.report_progress = AsyncMock()
+
+    with patch("redlib_mcp.client") as mock_client:
+        mock_client.get = AsyncMock(side_effect=lambda path, params=None: pages[(params or {}).get("after")])
+        result = json.loads(await get_subreddit.fn("rust", sort="top", time="week", max_pages=5, ctx=ctx))
+
+        assert mock_client.get.call_count == 3
+        assert all(call[1]["params"]["t"] == "week" for call in mock_client.get.call_args_list)
+
+    assert [p["id"] for p in result["data"]["posts"]] == ["p0_0", "p0_1", "p1_0", "p1_1", "p2_0", "p2_1"]
+    assert "extra" not in result["data"]["posts"][0]
+    assert result["data"]["after"] is None
+    assert result["data"]["subreddit"] == {"name": "rust"}
+    assert ctx.report_progress.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_search_reddit_max_items_truncates_and_sets_cursor():
+    from redlib_mcp import search_reddit
+
+    pages = make_listing_pages(5, 2)
+
+    with patch("redlib_mcp.client") as mock_client:
+        mock_client.get = AsyncMock(side_effect=lambda path, params=None: pages[params.get("after")])
+        result = json.loads(await search_reddit.fn("rust", max_items=3))
+
+        assert mock_client.get.call_count == 2
+
+    assert [p["id"] for p in result["data"]["posts"]] == ["p0_0", "p0_1", "p1_0"]
+    assert result["data"]["after"] == "t3_p1_0"
+
+
+@pytest.mark.asyncio
+async def test_get_user_max_pages_stops_at_limit():
+    from redlib_mcp import get_user
+
+    pages = make_listing_pages(5, 1)
+
+    with patch("redlib_mcp.client") as mock_client:
+        mock_client.get = AsyncMock(side_effect=lambda path, params=None: pages[(params or {}).get("after")])
+        result = json.loads(await get_user.fn("spez", max_pages=2))
+
+        assert mock_client.get.call_count == 2
+
+    assert len(result["data"]["posts"]) == 2
+    assert result["data"]["after"] == "t3_p1_0"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("limits", [{"max_pages": -1}, {"max_pages": 0}, {"max_items": -5}, {"max_items": 0}])
+async def test_listing_limits_must_be_positive(limits):
+    from redlib_mcp import get_subreddit
+
+    with patch("redlib_mcp.client") as mock_client:
+        mock_client.get = AsyncMock()
+        with pytest.raises(ValueError, match="must be at least 1"):
+            await get_subreddit.fn("rust", **limits)
+
+        mock_client.get.assert_not_called()
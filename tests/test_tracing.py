@@ -0,0 +1,94 @@
+import json
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from tests.helpers import make_response
+
+pytest.importorskip("opentelemetry.sdk")
+
+
+@pytest.fixture
+def spans(monkeypatch):
+    """Record spans in memory for the duration of a test."""
+    import redlib_mcp
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    monkeypatch.setattr(redlib_mcp, "tracer", provider.get_tracer("test"))
+    return exporter
+
+
+@pytest.mark.asyncio
+async def test_get_post_spans(spans):
+    from redlib_mcp import RateLimiter, RedlibClient, get_post
+
+    client = RedlibClient("http://localhost:8080", limiter=RateLimiter(rate=100, burst=10, max_concurrency=2))
+    payload = {"post": {"id": "abc123", "title": "T"}, "comments": []}
+
+    with patch("httpx.AsyncClient.get", AsyncMock(return_value=make_response(200, payload))), \
+            patch("redlib_mcp.client", client):
+        await get_post.fn("abc123")
+    await client.aclose()
+
+    by_name = {s.name: s for s in spans.get_finished_spans()}
+    assert set(by_name) == {"redlib.get", "redlib.fetch", "redlib.request", "strip_response", "serialize"}
+    assert by_name["redlib.get"].attributes["redlib.cache"] == "miss"
+    assert by_name["redlib.fetch"].parent.span_id == by_name["redlib.get"].context.span_id
+    assert by_name["redlib.request"].parent.span_id == by_name["redlib.fetch"].context.span_id
+    assert by_name["redlib.request"].attributes["http.response.status_code"] == 200
+    assert by_name["redlib.fetch"].attributes["redlib.pool_wait_seconds"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_tool_span_parents_everything(spans):
+    from fastmcp import Client
+    from redlib_mcp import Offloader, RedlibClient, server
+
+    offloader = Offloader(1, workers=1)
+    with patch("httpx.AsyncClient.get", AsyncMock(return_value=make_response(200, {"content": "wiki"}))), \
+            patch("redlib_mcp.client", RedlibClient("http://localhost:8080")), \
+            patch("redlib_mcp.offloader", offloader):
+        async with Client(server) as mcp:
+            await mcp.call_tool("get_wiki", {"subreddit": "rust"})
+    offloader.shutdown()
+
+    finished = spans.get_finished_spans()
+    tool = next(s for s in finished if s.name == "tool get_wiki")
+    # Spans from the offload thread stay in the tool call's trace
+    assert {s.name for s in finished if s.context.trace_id == tool.context.trace_id} >= {
+        "tool get_wiki", "redlib.get", "strip_response", "serialize",
+    }
+
+
+def test_file_exporter_writes_json_lines(tmp_path, monkeypatch):
+    import redlib_mcp
+    from redlib_mcp import init_tracing, load_tracing_config, shutdown_tracing, span
+
+    monkeypatch.setattr(redlib_mcp, "tracer", None)
+    monkeypatch.setattr(redlib_mcp, "tracer_provider", None)
+    monkeypatch.setattr(redlib_mcp, "trace_file", None)
+    monkeypatch.setenv("REDLIB_TRACING", "file")
+    monkeypatch.setenv("REDLIB_TRACING_FILE", str(tmp_path / "traces.jsonl"))
+
+    with patch("redlib_mcp.read_config_file", return_value={}):
+        assert init_tracing(load_tracing_config())
+    trace_file = redlib_mcp.trace_file
+    with span("strip_response"):
+        pass
+    shutdown_tracing()
+
+    lines = (tmp_path / "traces.jsonl").read_text().splitlines()
+    assert json.loads(lines[0])["name"] == "strip_response"
+    assert trace_file.closed
+    assert redlib_mcp.tracer is None
+
+
+def test_tracing_off_by_default():
+    from redlib_mcp import load_tracing_config
+
+    with patch("redlib_mcp.read_config_file", return_value={}):
+        assert load_tracing_config() is None